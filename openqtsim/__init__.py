@@ -4,10 +4,17 @@ __author__ = "Mark van Koningsveld and Joris den Uijl"
 __email__ = "m.vankoningsveld@tudelft.nl"
 __version__ = "v0.5.1"
 
+from . import analytics, ctmc, distributions, fitting, heap_engine, plotting, rare_event
 from .arrival_process import ArrivalProcess
+from .batch_engine import lindley, worker_batch
+from .capacity import CapacitySchedule
 from .customer import Customer
+from .ensemble import ensemble, resample_state
 from .mm1 import MM1
-from .mt_engine import worker, Task
+from .mt_engine import worker, heap_worker, batch_worker, run_tasks, Task
 from .queue import Queue
+from .server_pool import ServerPool
 from .service_process import ServiceProcess
 from .simulation import Simulation
+from .system_state import SystemState
+from .sweep import sweep, task_grid, scenario_hash, ResultCache
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+
+def _per_server(df_cust, tol=1e-9):
+    """
+    Return the customer log sorted per server and time service begins, plus per row the idle gap that precedes the
+    service and whether a new busy period starts. Servers are returned as codes (0, 1, ..) into the sorted array
+    of s_id's. Logs without s_id (e.g. MM1) count as one server.
+    """
+
+    s_id = df_cust["s_id"].to_numpy() if "s_id" in df_cust else np.ones(len(df_cust), dtype=int)
+    TSB = df_cust["TSB"].to_numpy(dtype=float)
+    TSE = df_cust["TSE"].to_numpy(dtype=float)
+
+    # a stable sort on small integer codes is a radix sort, which is much faster than a lexsort on (s_id, TSB)
+    codes, servers = pd.factorize(s_id, sort=True)
+    codes = codes.astype(np.min_scalar_type(len(servers)))
+    order = np.argsort(codes, kind="stable")
+
+    # with FIFO service a log in order of arrival is already in order of TSB per server, otherwise sort on TSB too
+    same_server = codes[order][1:] == codes[order][:-1]
+    if np.any((TSB[order][1:] < TSB[order][:-1]) & same_server):
+        order = np.lexsort((TSB, codes))
+
+    codes, TSB, TSE = codes[order], TSB[order], TSE[order]
+
+    # the first customer of each server follows on an idle period that started at t = 0
+    first = np.ones(len(codes), dtype=bool)
+    first[1:] = codes[1:] != codes[:-1]
+
+    prev_TSE = np.empty_like(TSE)
+    prev_TSE[1:] = TSE[:-1]
+    prev_TSE[first] = 0
+
+    gap = TSB - prev_TSE
+    new_period = first | (gap > tol)
+
+    return codes, servers, TSB, TSE, gap, new_period
+
+
+def busy_periods(df_cust):
+    """
+    Return a dataframe with one row per busy period of each server: s_id, start, end, length and the number of
+    customers served in the busy period
+    """
+
+    codes, servers, TSB, TSE, gap, new_period = _per_server(df_cust)
+
+    starts = np.flatnonzero(new_period)
+    ends = np.append(starts[1:], len(codes)) - 1
+
+    return pd.DataFrame({
+        "s_id": servers[codes[starts]],
+        "start": TSB[starts],
+        "end": TSE[ends],
+        "length": TSE[ends] - TSB[starts],
+        "customers": ends - starts + 1})
+
+
+def idle_gaps(df_cust):
+    """
+    Return a dataframe with one row per idle period of each server that ended with the arrival of a customer:
+    s_id, start, end and length
+    """
+
+    codes, servers, TSB, TSE, gap, new_period = _per_server(df_cust)
+
+    return pd.DataFrame({
+        "s_id": servers[codes[new_period]],
+        "start": TSB[new_period] - gap[new_period],
+        "end": TSB[new_period],
+        "length": gap[new_period]})
+
+
+def server_stats(df_cust, horizon=None):
+    """
+    Return per server (s_id): nr of customers, busy time, idle time, utilisation, nr of busy periods and
+    mean busy period length. The horizon defaults to the last time service ends.
+    """
+
+    codes, servers, TSB, TSE, gap, new_period = _per_server(df_cust)
+
+    if horizon is None:
+        horizon = TSE.max()
+
+    n = len(servers)
+    df = pd.DataFrame({
+        "customers": np.bincount(codes, minlength=n),
+        "busy_time": np.bincount(codes, weights=TSE - TSB, minlength=n),
+        "busy_periods": np.bincount(codes[new_period], minlength=n)},
+        index=pd.Index(servers, name="s_id"))
+
+    df["mean_busy_period"] = df["busy_time"] / df["busy_periods"]
+    df["idle_time"] = horizon - df["busy_time"]
+    df["utilisation"] = df["busy_time"] / horizon
+
+    return df
+
+
+def histogram(df, column="length", bins=50, by_server=False):
+    """
+    Histogram of a column of busy_periods or idle_gaps. Returns (counts, edges); with by_server the counts have
+    one row per server (in order of s_id) and the servers are returned as well.
+    """
+
+    values = df[column].to_numpy()
+    edges = np.histogram_bin_edges(values, bins=bins)
+
+    if not by_server:
+        counts, edges = np.histogram(values, bins=edges)
+        return counts, edges
+
+    servers, index = np.unique(df["s_id"].to_numpy(), return_inverse=True)
+    counts, _, edges = np.histogram2d(index, values, bins=[np.arange(len(servers) + 1) - 0.5, edges])
+
+    return counts.astype(int), edges, servers
@@ -1,3 +1,4 @@
+from openqtsim import distributions
 
 
 class ArrivalProcess:
@@ -5,22 +6,37 @@ class ArrivalProcess:
     Arrival process class for use in the OpenQTSim package
     """
 
-    def __init__(self, symbol='M', arr_rate=8):
+    def __init__(self, symbol='M', arr_rate=8, distribution=None, **params):
         """
-        symbol: symbol of the process (M, E_k, etc.)
+        symbol: symbol of the process (M, E_k, D, G or any other symbol in distributions.DISTRIBUTIONS)
         arr_rate: arrivals per hour
+        distribution: explicit distribution of the inter arrival times (for G), a Distribution or scipy frozen object
+        params: parameters of the registered distribution, e.g. sigma for LN or data for Emp
         """
 
         self.symbol = symbol
         self.arr_rate = arr_rate
+        self.distribution = distribution
+        self.params = params
 
-    def get_IAT(self, customer_nr=[]):
+    def get_distribution(self):
+        """
+        Return the distribution of the inter arrival times (not for D), with mean 1 / arr_rate
+        """
+
+        if self.distribution is not None:
+            return distributions.as_distribution(self.distribution)
+
+        mean = 1 / self.arr_rate if self.arr_rate is not None else None
+        return distributions.from_symbol(self.symbol, mean=mean, **self.params)
+
+    def get_IAT(self, arrival_distribution, customer_nr=[]):
         """
         Return the inter arrival time based on the inter arrival time distribution or deterministic list
+        - arrival_distribution: the Sampler (or for D the dataframe) of the Simulation, which owns the random stream
         """
 
-        if self.symbol == "M" or self.symbol[0] == "E":
-            return self.arrival_distribution.rvs()
+        if self.symbol == "D":
+            return arrival_distribution.loc[customer_nr, ['IAT']].item()
 
-        elif self.symbol == "D":
-            return self.arrival_distribution.loc[customer_nr, ['IAT']].item()
+        return arrival_distribution.rvs()
@@ -0,0 +1,109 @@
+import numpy as np
+
+from openqtsim import distributions
+
+
+def lindley(IAT, ST):
+    """
+    Return the waiting times in the queue (TCWQ) of single server FIFO queues for given inter arrival times and
+    service times. IAT and ST are arrays of shape (scenarios, customers) or (customers,).
+    The Lindley recursion W[n] = max(0, W[n-1] + ST[n-1] - IAT[n]) is solved in closed form as W[n] = X[n] - min(X[:n+1])
+    with X the cumulative sum of ST[n-1] - IAT[n], so the whole array is processed without a python loop.
+    """
+
+    IAT = np.atleast_2d(np.asarray(IAT, dtype=float))
+    ST = np.atleast_2d(np.asarray(ST, dtype=float))
+
+    X = np.empty(IAT.shape)
+    X[:, 0] = 0  # the first customer arrives at an empty system
+    np.subtract(ST[:, :-1], IAT[:, 1:], out=X[:, 1:])
+    np.cumsum(X, axis=1, out=X)
+
+    W = np.minimum.accumulate(X, axis=1)
+    np.subtract(X, W, out=W)
+
+    return W
+
+
+def draw(process, mean, size, rng):
+    """
+    Draw an array of the given size from a process, either a symbol from the distribution registry (e.g. "M", "E2")
+    or a Distribution object, scaled per row with the array of means
+    """
+
+    if isinstance(process, str):
+        distribution = distributions.from_symbol(process, mean=1.0)
+    else:
+        distribution = distributions.as_distribution(process)
+
+    mean = np.asarray(mean, dtype=float).reshape(-1, 1)
+
+    return distribution.sample(size, rng) * (mean / distribution.mean)
+
+
+def draw_stream(process, mean, size, rng):
+    """
+    Draw the values of one scenario from its own random stream in the blocks of a Sampler, like the SimPy and heap
+    engines do, so that the same stream gives the same values in each engine
+    """
+
+    if isinstance(process, str):
+        return distributions.Sampler(distributions.from_symbol(process, mean=mean), rng).rvs(size)
+
+    distribution = distributions.as_distribution(process)
+    return distributions.Sampler(distribution, rng).rvs(size) * (mean / distribution.mean)
+
+
+def worker_batch(lam, mu, nr_arr, A="M", S="M", seed=None, max_bytes=2 ** 27):
+    """
+    Return the waiting time as a factor of service time (as mt_engine.worker does) for many single server FIFO
+    queues at once.
+    - lam, mu, nr_arr: arrays (or scalars) with the arrival rate, service rate and nr of arrivals per scenario
+    - A, S: arrival and service process, as a symbol from the distribution registry or a Distribution object
+    - seed: one seed for the whole batch, or a sequence with a seed per scenario (the result of a scenario is then
+      independent of the other scenarios in the batch; scenarios with seed None draw from fresh entropy). A seed per
+      scenario draws from the arrival and server streams of spawn_streams(seed, 1), so a scenario simulates the same
+      customers as the SimPy and heap engines with that seed.
+    - max_bytes: approximate memory budget; the scenarios are processed in blocks that fit within it
+    """
+
+    lam, mu, nr_arr = np.broadcast_arrays(np.asarray(lam, dtype=float), np.asarray(mu, dtype=float),
+                                          np.asarray(nr_arr, dtype=int))
+    lam, mu, nr_arr = lam.ravel(), mu.ravel(), nr_arr.ravel()
+
+    per_scenario_seed = seed is not None and np.ndim(seed) > 0
+    rng = None if per_scenario_seed else np.random.default_rng(seed)
+
+    factor = np.empty(len(lam))
+
+    # about four arrays of (rows x customers) float64's are alive at the same time
+    max_n = int(nr_arr.max()) if len(nr_arr) else 0
+    rows = max(1, int(max_bytes // (32 * max(max_n, 1))))
+
+    for start in range(0, len(lam), rows):
+        block = slice(start, start + rows)
+        n = int(nr_arr[block].max())
+        shape = (len(lam[block]), n)
+
+        if per_scenario_seed:
+            IAT = np.ones(shape)
+            ST = np.zeros(shape)
+            for i, s in enumerate(seed[block]):
+                streams = distributions.spawn_streams(s, 1)
+                m = nr_arr[block][i]
+                IAT[i, :m] = draw_stream(A, 1 / lam[block][i], m, streams["arrival"])
+                ST[i, :m] = draw_stream(S, 1 / mu[block][i], m, streams["servers"][1])
+        else:
+            IAT = draw(A, 1 / lam[block], shape, rng)
+            ST = draw(S, 1 / mu[block], shape, rng)
+
+        W = lindley(IAT, ST)
+
+        # customers beyond nr_arr of a scenario are padding and do not count
+        padding = np.arange(n) >= nr_arr[block][:, None]
+        W[padding] = 0
+        ST[padding] = 0
+
+        factor[block] = W.sum(axis=1) / ST.sum(axis=1)
+
+    return factor
@@ -0,0 +1,126 @@
+import numpy as np
+
+from openqtsim import distributions
+
+
+class CapacitySchedule:
+    """
+    Time dependent availability of the servers, from a shift schedule and random breakdowns.
+    - times, capacity: calendar of events (hours from the start of the simulation); from times[j] on, the servers
+      with id <= capacity[j] are on shift. Before the first event all c servers are available.
+    - mtbf: mean time between failures of each server (exponential, in calendar time); None for no breakdowns
+    - repair: distribution of the repair times (a Distribution, scipy frozen object or a mean for an exponential)
+    Servers are not preempted: a server that goes off shift or breaks down finishes the customer in service and
+    starts no new service until it is available again.
+    The schedule only describes the availability and holds no state of a run, so it can be shared between runs and
+    threads. Each run calls start with its own random streams (see Availability).
+    """
+
+    def __init__(self, c, times=(), capacity=(), mtbf=None, repair=1.0, block=64):
+        self.c = c
+        self.times = np.asarray(times, dtype=float)
+        self.capacity = np.asarray(capacity, dtype=int)
+
+        # next_index[i - 1, j]: first calendar event >= j from which server i is on shift (len(times): never)
+        n = len(self.times)
+        on_shift = self.capacity[None, :] >= np.arange(1, c + 1)[:, None]
+        index = np.where(on_shift, np.arange(n)[None, :], n)
+        self.next_index = np.minimum.accumulate(index[:, ::-1], axis=1)[:, ::-1]
+
+        self.mtbf = mtbf
+        if np.isscalar(repair):
+            repair = distributions.Exponential(repair)
+        self.repair = distributions.as_distribution(repair)
+        self.block = block
+
+    def start(self, streams=None):
+        """
+        Return the Availability of the servers for one run
+        - streams: {s_id: Generator} with the breakdown stream of each server (see distributions.spawn_streams) or a
+          seed (the breakdowns are then the same as in a simulation with that seed)
+        """
+
+        return Availability(self, streams)
+
+    def check(self, c):
+        """
+        Raise a ValueError if the schedule does not describe the c servers of a queue
+        """
+
+        if self.c != c:
+            raise ValueError("The CapacitySchedule describes {} servers, the queue has {}".format(self.c, c))
+
+    def _shift_up(self, s_id, t):
+        """
+        First time >= t at which server s_id is on shift
+        """
+
+        j = np.searchsorted(self.times, t, side="right") - 1
+        if j < 0:
+            return t
+
+        k = self.next_index[s_id - 1, j]
+        if k == j:
+            return t
+        elif k == len(self.times):
+            return np.inf
+
+        return self.times[k]
+
+
+
+class Availability:
+    """
+    Availability of the servers during one run of a simulation: the shifts of the CapacitySchedule plus breakdown
+    windows that are drawn, in blocks as the run proceeds, from the random stream of each server. Since every server
+    has its own stream, the windows do not depend on the order in which an engine asks for them.
+    """
+
+    def __init__(self, schedule, streams=None):
+        self.schedule = schedule
+
+        # a seed gives the same breakdowns as a simulation with that seed
+        if not isinstance(streams, dict):
+            streams = distributions.spawn_streams(streams, schedule.c)["breakdowns"]
+        self.streams = streams
+
+        # breakdown windows per server, generated in blocks as the simulation proceeds
+        self.failures = {i: (np.zeros(0), np.zeros(0)) for i in range(1, schedule.c + 1)}
+
+    def _repaired(self, s_id, t):
+        """
+        First time >= t at which server s_id is not broken down
+        """
+
+        schedule = self.schedule
+        starts, ends = self.failures[s_id]
+
+        # make sure the windows cover t
+        while not len(ends) or ends[-1] <= t:
+            rng = self.streams[s_id]
+            gaps = rng.standard_exponential(schedule.block) * schedule.mtbf
+            repairs = schedule.repair.sample(schedule.block, rng)
+            end = ends[-1] if len(ends) else 0.
+            new_ends = end + np.cumsum(gaps + repairs)
+            starts = np.append(starts, new_ends - repairs)
+            ends = np.append(ends, new_ends)
+            self.failures[s_id] = (starts, ends)
+
+        j = np.searchsorted(starts, t, side="right") - 1
+        if j >= 0 and t < ends[j]:
+            return ends[j]
+
+        return t
+
+    def next_up(self, s_id, t):
+        """
+        Return the first time >= t at which server s_id can start a service (np.inf if never)
+        """
+
+        while True:
+            up = self.schedule._shift_up(s_id, t)
+            if self.schedule.mtbf is not None and np.isfinite(up):
+                up = self._repaired(s_id, up)
+            if up == t:
+                return t
+            t = up
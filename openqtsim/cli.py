@@ -0,0 +1,187 @@
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from openqtsim.mt_engine import Task, batch_worker, engines
+from openqtsim.sweep import task_grid
+
+
+def task_from_dict(fields):
+    """
+    Return a Task from a dictionary with its fields (a missing or empty seed gives None)
+    """
+
+    fields = dict(fields)
+    seed = fields.pop("seed", None)
+    seed = None if seed is None or (isinstance(seed, float) and np.isnan(seed)) else int(seed)
+
+    return Task(fields["A"], fields["S"], int(fields["c"]), int(fields["nr_arr"]), fields["lam"], fields["mu"], seed)
+
+
+def load_tasks(path):
+    """
+    Return the Tasks and the settings of a scenario file:
+    - csv: one Task per row, with the fields of Task as columns
+    - yaml or json: a list of Tasks, or a mapping with a list of "tasks" and/or a "grid" with lists of values per
+      field (see task_grid); other keys (engine, workers, executor, chunk) are settings for the command line options
+    """
+
+    path = str(path)
+
+    if path.endswith(".csv"):
+        return [task_from_dict(row) for row in pd.read_csv(path).to_dict("records")], {}
+
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Reading yaml scenario files requires PyYAML, use a json file otherwise")
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    if isinstance(config, list):
+        config = {"tasks": config}
+
+    tasks = [task_from_dict(fields) for fields in config.get("tasks", [])]
+    if "grid" in config:
+        grid = {key: value if isinstance(value, list) else [value] for key, value in config["grid"].items()}
+        tasks += task_grid(**grid)
+
+    settings = {key: value for key, value in config.items() if key not in ("tasks", "grid")}
+
+    return tasks, settings
+
+
+class ResultWriter:
+    """
+    Append chunks of results to a csv file or, if the path ends with .parquet, to a parquet file (requires pyarrow)
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.parquet = self.path.endswith(".parquet")
+        self.writer = None
+        self.header = True
+
+        if self.parquet:
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError("Writing parquet files requires pyarrow, use a csv file otherwise")
+            self.pa = pyarrow
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, df):
+        if self.parquet:
+            table = self.pa.Table.from_pandas(df, preserve_index=False)
+            if self.writer is None:
+                self.writer = self.pa.parquet.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+            self.header = False
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def results_frame(tasks, factors):
+    """
+    Return a dataframe with the fields of the Tasks and their waiting factors; the dtypes do not depend on the
+    values, so that chunks can be appended to the same parquet file
+    """
+
+    df = pd.DataFrame(tasks, columns=Task._fields)
+    df = df.astype({"A": str, "S": str, "c": "int64", "nr_arr": "int64", "lam": float, "mu": float, "seed": "Int64"})
+    df["waiting_factor"] = np.asarray(factors, dtype=float)
+
+    return df
+
+
+def main(argv=None):
+    """
+    Run the scenarios of a yaml, json or csv file and write the waiting factors (mean waiting time over mean
+    service time) to a csv or parquet file, chunk by chunk
+    """
+
+    parser = argparse.ArgumentParser(prog="openqtsim", description=main.__doc__)
+    parser.add_argument("scenarios", help="yaml, json or csv file with the scenarios")
+    parser.add_argument("-o", "--output", default="results.csv", help="csv or parquet file for the results")
+    parser.add_argument("-e", "--engine", choices=["simpy", "heap", "batch"], help="simulation engine (simpy)")
+    parser.add_argument("-w", "--workers", type=int, help="nr of threads or processes (nr of cores)")
+    parser.add_argument("-x", "--executor", choices=["thread", "process"], help="thread or process pool (process)")
+    parser.add_argument("--chunk", type=int,
+                        help="nr of tasks per written chunk and per call of the batch engine (4 per worker)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print progress")
+    args = parser.parse_args(argv)
+
+    tasks, settings = load_tasks(args.scenarios)
+
+    engine = args.engine or settings.get("engine", "simpy")
+    workers = args.workers or settings.get("workers") or multiprocessing.cpu_count()
+    executor = args.executor or settings.get("executor", "process")
+    chunk = args.chunk or settings.get("chunk") or 4 * workers
+
+    # the pool is created once; the batch engine gets chunks of tasks, the other engines single tasks
+    if engine == "batch":
+        func, items = batch_worker, [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
+    else:
+        func, items = engines[engine], tasks
+
+    if executor == "thread":
+        pool = ThreadPoolExecutor(workers)
+        results = pool.map(func, items)
+    elif executor == "process":
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap(func, items, chunksize=max(1, len(items) // (4 * workers)) if engine != "batch" else 1)
+    else:
+        raise ValueError("Unknown executor '{}', choose 'thread' or 'process'".format(executor))
+
+    start = time.perf_counter()
+    try:
+        with ResultWriter(args.output) as writer:
+            done, part, factors = 0, [], []
+            for item, result in zip(items, results):
+                if engine == "batch":
+                    part.extend(item)
+                    factors.extend(result)
+                else:
+                    part.append(item)
+                    factors.append(result)
+
+                # results come in the order of the tasks and are written every chunk tasks
+                if len(part) >= chunk or done + len(part) == len(tasks):
+                    writer.write(results_frame(part, factors))
+                    done, part, factors = done + len(part), [], []
+
+                    if not args.quiet:
+                        duration = time.perf_counter() - start
+                        print("{}/{} tasks, {:.1f} s, {:.1f} tasks/s".format(
+                            done, len(tasks), duration, done / duration), file=sys.stderr)
+    finally:
+        if executor == "thread":
+            pool.shutdown()
+        else:
+            pool.terminate()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse, stats
+
+
+def parameters(queue):
+    """
+    Return (lam, mu, c, K) of an M/M/c/K Queue object, with mu the service rate per server
+    """
+
+    if queue.A.symbol != "M" or queue.S.symbol != "M":
+        raise ValueError("The CTMC solver requires an M/M/c/K queue, got {}".format(queue.kendall_notation))
+
+    return queue.A.arr_rate, queue.S.srv_rate, queue.c, queue.K
+
+
+def _truncation(lam, mu, c, K, tol=1e-12, n_max=100000):
+    """
+    Return the nr of states needed for all parameter sets. Infinite systems are truncated where the tail of the
+    geometric queue length distribution drops below tol.
+    """
+
+    finite = np.isfinite(K)
+    rho = lam / (c * mu)
+
+    if np.any(~finite & (rho >= 1)):
+        raise ValueError("An M/M/c queue with infinite capacity and utilisation >= 1 has no stationary distribution")
+
+    with np.errstate(divide="ignore"):
+        tail = np.where(finite, 0, np.ceil(np.log(tol) / np.log(np.where(finite, 0.5, rho))))
+    n = np.where(finite, K, c + tail)
+
+    return int(min(n.max(), n_max)) + 1
+
+
+def _rates(lam, mu, c, K, n_max=None):
+    """
+    Return the birth and death rates of the states 0 .. N-1 as arrays of shape (parameter sets, N)
+    """
+
+    lam, mu, c, K = (np.atleast_1d(np.asarray(x, dtype=float)) for x in np.broadcast_arrays(lam, mu, c, K))
+    N = _truncation(lam, mu, c, K) if n_max is None else n_max + 1
+
+    n = np.arange(N)
+    K_eff = np.minimum(K, N - 1)[:, None]
+
+    birth = np.where(n < K_eff, lam[:, None], 0.)
+    death = np.where(n <= K_eff, np.minimum(n, c[:, None]) * mu[:, None], 0.)
+
+    return birth, death
+
+
+def generator(lam, mu, c, K=np.inf, n_max=None):
+    """
+    Return the generator matrix Q (scipy.sparse) of the birth-death process of a single M/M/c/K queue
+    """
+
+    birth, death = _rates(lam, mu, c, K, n_max)
+    if len(birth) != 1:
+        raise ValueError("generator takes a single parameter set, got {}; use stationary or transient for arrays"
+                         .format(len(birth)))
+    birth, death = birth[0], death[0]
+
+    Q = sparse.diags([death[1:], -(birth + death), birth[:-1]], offsets=[-1, 0, 1], format="csr")
+
+    return Q
+
+
+def stationary(lam, mu, c, K=np.inf, n_max=None):
+    """
+    Return the stationary distributions p[n] of M/M/c/K queues, shape (parameter sets, states). The inputs can be
+    scalars or arrays (one element per parameter set); mu is the service rate per server.
+    """
+
+    birth, death = _rates(lam, mu, c, K, n_max)
+
+    # p[n] / p[0] = prod(birth[i - 1] / death[i], i = 1 .. n), evaluated in log space to avoid overflow; states
+    # beyond the capacity K of a parameter set (birth 0) are not reached
+    log_ratio = np.full(death[:, 1:].shape, -np.inf)
+    reached = birth[:, :-1] > 0
+    log_ratio[reached] = np.log(birth[:, :-1][reached]) - np.log(death[:, 1:][reached])
+    log_p = np.concatenate([np.zeros((len(birth), 1)), np.cumsum(log_ratio, axis=1)], axis=1)
+
+    p = np.exp(log_p - log_p.max(axis=1, keepdims=True))
+
+    return p / p.sum(axis=1, keepdims=True)
+
+
+def transient(lam, mu, c, K=np.inf, t=1.0, p0=None, n_max=None, tol=1e-10):
+    """
+    Return the distributions p[n] at the times t (shape: parameter sets, times, states) of M/M/c/K queues that
+    start in p0 (default: empty system), by uniformisation: p(t) = sum_k Poisson(k; L t) p0 P^k with
+    P = I + Q / L. The product with the tridiagonal P is done for all parameter sets at once.
+    """
+
+    birth, death = _rates(lam, mu, c, K, n_max)
+    m, N = birth.shape
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+
+    if p0 is None:
+        p0 = np.zeros(N)
+        p0[0] = 1
+    v = np.broadcast_to(np.asarray(p0, dtype=float), (m, N)).copy()
+
+    L = (birth + death).max(axis=1, keepdims=True)
+    L[L == 0] = 1
+    stay = 1 - (birth + death) / L
+    up = birth / L
+    down = death / L
+
+    # nr of terms such that the truncated Poisson tail is below tol for every parameter set and time
+    Lt = L * t[None, :]
+    n_terms = int(stats.poisson.ppf(1 - tol, Lt.max())) + 1
+    weights = stats.poisson.pmf(np.arange(n_terms)[:, None, None], Lt[None, :, :])
+
+    p = np.zeros((m, len(t), N))
+    for k in range(n_terms):
+        p += weights[k][:, :, None] * v[:, None, :]
+
+        nxt = v * stay
+        nxt[:, 1:] += v[:, :-1] * up[:, :-1]
+        nxt[:, :-1] += v[:, 1:] * down[:, 1:]
+        v = nxt
+
+    return p
+
+
+def measures(lam, mu, c, K=np.inf, n_max=None):
+    """
+    Return a dataframe with the stationary performance measures of M/M/c/K queues (one row per parameter set),
+    with the same definitions as Simulation.get_stats
+    """
+
+    lam, mu, c, K = (np.atleast_1d(np.asarray(x, dtype=float)) for x in np.broadcast_arrays(lam, mu, c, K))
+    p = stationary(lam, mu, c, K, n_max)
+    n = np.arange(p.shape[1])
+
+    L_s = p @ n
+    L_q = (p * np.maximum(n[None, :] - c[:, None], 0)).sum(axis=1)
+    P_block = np.where(np.isfinite(K), p[np.arange(len(p)), np.minimum(K, p.shape[1] - 1).astype(int)], 0)
+    lam_eff = lam * (1 - P_block)
+
+    return pd.DataFrame({
+        "P_0": p[:, 0],
+        "P_block": P_block,
+        "Rho_server": (L_s - L_q) / c,
+        "L_s": L_s,
+        "L_q": L_q,
+        "W_s": L_s / lam_eff,
+        "W_q": L_q / lam_eff,
+        "waiting_factor": L_q / lam_eff * mu})
@@ -0,0 +1,311 @@
+import re
+
+import numpy as np
+
+DISTRIBUTIONS = {}
+
+
+def register(symbol):
+    """
+    Class decorator that registers a distribution under a Kendall symbol, e.g. @register("LN")
+    """
+
+    def decorator(cls):
+        cls.symbol = symbol
+        DISTRIBUTIONS[symbol] = cls
+        return cls
+
+    return decorator
+
+
+def from_symbol(symbol, mean=None, **params):
+    """
+    Return the registered distribution that belongs to a Kendall symbol with the given mean. A numeric suffix of the
+    symbol is passed on as k, so "E2" gives Erlang(mean, k=2) and "H3" gives HyperExponential(mean, k=3).
+    """
+
+    match = re.fullmatch(r"([A-Za-z]+?)(\d*)", symbol)
+    if match is None or match.group(1) not in DISTRIBUTIONS:
+        raise ValueError("No distribution registered for the symbol '{}'".format(symbol))
+
+    name, k = match.groups()
+    if k:
+        params["k"] = int(k)
+
+    return DISTRIBUTIONS[name](mean=mean, **params)
+
+
+def as_distribution(distribution):
+    """
+    Return the distribution as a Distribution object; scipy frozen distributions are wrapped in ScipyDistribution
+    """
+
+    if isinstance(distribution, Distribution):
+        return distribution
+
+    return ScipyDistribution(distribution)
+
+
+def generator(rng=None):
+    """
+    Return rng as a numpy random Generator: None gives a new Generator seeded from the OS, an int a seeded one
+    """
+
+    if isinstance(rng, np.random.Generator):
+        return rng
+
+    return np.random.default_rng(rng)
+
+
+def spawn_streams(seed, c):
+    """
+    Return independent random Generators for a simulation with c servers, all spawned from one seed:
+    {"arrival": Generator, "servers": {s_id: Generator}, "policy": Generator, "breakdowns": {s_id: Generator}}.
+    The engines use the same layout, so the same seed gives the same inter arrival times, service times and
+    breakdowns per server in each engine.
+    """
+
+    *children, breakdowns = np.random.SeedSequence(seed).spawn(c + 3)
+    arrival, policy, *servers = [np.random.default_rng(s) for s in children]
+    breakdowns = [np.random.default_rng(s) for s in breakdowns.spawn(c)]
+
+    return {"arrival": arrival, "servers": dict(zip(range(1, c + 1), servers)), "policy": policy,
+            "breakdowns": dict(zip(range(1, c + 1), breakdowns))}
+
+
+class Distribution:
+    """
+    Base class of the distributions for inter arrival times and service times. Subclasses implement sample(size, rng)
+    which draws a whole array at once from a numpy random Generator (without one a fresh Generator is used).
+    """
+
+    symbol = None
+    mean = None
+
+    def sample(self, size, rng=None):
+        raise NotImplementedError
+
+    def rvs(self, size=None, random_state=None):
+        """
+        Draw like a scipy frozen distribution: a single float without size, an array otherwise
+        """
+
+        if size is None:
+            return float(self.sample(1, random_state)[0])
+
+        return self.sample(size, random_state)
+
+
+@register("M")
+class Exponential(Distribution):
+    """
+    Exponential distribution (M)
+    """
+
+    def __init__(self, mean=1.0):
+        self.mean = mean
+
+    def sample(self, size, rng=None):
+        rng = generator(rng)
+        return rng.standard_exponential(size) * self.mean
+
+
+@register("E")
+class Erlang(Distribution):
+    """
+    Erlang distribution with k phases (E<k>)
+    """
+
+    def __init__(self, mean=1.0, k=2):
+        self.mean = mean
+        self.k = k
+
+    def sample(self, size, rng=None):
+        rng = generator(rng)
+        return rng.standard_gamma(self.k, size) * (self.mean / self.k)
+
+
+@register("Gamma")
+class Gamma(Distribution):
+    """
+    Gamma distribution with a (non-integer) shape parameter
+    """
+
+    def __init__(self, mean=1.0, shape=1.0):
+        self.mean = mean
+        self.shape = shape
+
+    def sample(self, size, rng=None):
+        rng = generator(rng)
+        return rng.standard_gamma(self.shape, size) * (self.mean / self.shape)
+
+
+@register("LN")
+class Lognormal(Distribution):
+    """
+    Lognormal distribution, with sigma the standard deviation of log(x)
+    """
+
+    def __init__(self, mean=1.0, sigma=0.5):
+        self.mean = mean
+        self.sigma = sigma
+
+    def sample(self, size, rng=None):
+        rng = generator(rng)
+        return rng.lognormal(np.log(self.mean) - self.sigma ** 2 / 2, self.sigma, size)
+
+
+@register("H")
+class HyperExponential(Distribution):
+    """
+    Hyperexponential distribution (H<k>): with probability probs[i] an exponential with mean means[i].
+    Instead of probs and means a coefficient of variation cv > 1 can be given for a two phase distribution
+    with balanced means.
+    """
+
+    def __init__(self, mean=None, k=2, probs=None, means=None, cv=None):
+        if probs is None:
+            if k != 2 or cv is None or mean is None:
+                raise ValueError("Give probs and means, or a mean and cv for a two phase hyperexponential")
+
+            p = 0.5 * (1 + np.sqrt((cv ** 2 - 1) / (cv ** 2 + 1)))
+            probs = [p, 1 - p]
+            means = [mean / (2 * p), mean / (2 * (1 - p))]
+
+        self.probs = np.asarray(probs, dtype=float)
+        self.means = np.asarray(means, dtype=float)
+
+        # an explicit mean rescales the phases
+        own_mean = self.probs @ self.means
+        if mean is not None:
+            self.means = self.means * mean / own_mean
+        self.mean = self.probs @ self.means
+
+    def sample(self, size, rng=None):
+        rng = generator(rng)
+        phase = np.searchsorted(np.cumsum(self.probs)[:-1], rng.random(size), side="right")
+        return rng.standard_exponential(size) * self.means[phase]
+
+
+@register("PH")
+class PhaseType(Distribution):
+    """
+    Phase-type distribution: time until absorption of a Markov chain with initial distribution alpha over the
+    transient phases and sub-generator T. An explicit mean rescales T.
+    """
+
+    def __init__(self, mean=None, alpha=(1.0,), T=((-1.0,),)):
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.T = np.asarray(T, dtype=float)
+
+        own_mean = self.alpha @ np.linalg.solve(-self.T, np.ones(len(self.alpha)))
+        if mean is not None:
+            self.T = self.T * own_mean / mean
+        self.mean = self.alpha @ np.linalg.solve(-self.T, np.ones(len(self.alpha)))
+
+        # jump chain: from each phase go to another phase or to absorption (the last column)
+        rates = -np.diag(self.T)
+        jumps = np.hstack([self.T, -self.T.sum(axis=1, keepdims=True)]) / rates[:, None]
+        jumps[np.arange(len(rates)), np.arange(len(rates))] = 0
+        self.rates = rates
+        self.cum_jumps = np.cumsum(jumps, axis=1)
+
+    def sample(self, size, rng=None):
+        rng = generator(rng)
+        n = int(np.prod(size))
+        m = len(self.alpha)
+
+        x = np.zeros(n)
+        phase = np.searchsorted(np.cumsum(self.alpha)[:-1], rng.random(n), side="right")
+        alive = np.flatnonzero(phase < m)
+
+        # all samples make their jumps at the same time, until every sample is absorbed
+        while len(alive):
+            x[alive] += rng.standard_exponential(len(alive)) / self.rates[phase[alive]]
+            u = rng.random(len(alive))
+            phase[alive] = (u[:, None] > self.cum_jumps[phase[alive]]).sum(axis=1)
+            alive = alive[phase[alive] < m]
+
+        return x.reshape(size)
+
+
+@register("Emp")
+class Empirical(Distribution):
+    """
+    Empirical distribution that resamples observed values. With a bandwidth (a number or "scott") the values are
+    smoothed with a Gaussian kernel, reflected at zero to keep them positive. An explicit mean rescales the data.
+    """
+
+    def __init__(self, mean=None, data=(1.0,), bandwidth=None):
+        self.data = np.asarray(data, dtype=float)
+        if mean is not None:
+            self.data = self.data * mean / self.data.mean()
+        self.mean = self.data.mean()
+
+        if bandwidth == "scott":
+            bandwidth = self.data.std() * len(self.data) ** (-1 / 5)
+        self.bandwidth = bandwidth
+
+    def sample(self, size, rng=None):
+        rng = generator(rng)
+        x = rng.choice(self.data, size)
+
+        if self.bandwidth:
+            x = np.abs(x + self.bandwidth * rng.standard_normal(size))
+
+        return x
+
+
+class ScipyDistribution(Distribution):
+    """
+    Wrapper around a scipy frozen distribution (G)
+    """
+
+    symbol = "G"
+
+    def __init__(self, frozen):
+        self.frozen = frozen
+        self.mean = frozen.mean()
+
+    def sample(self, size, rng=None):
+        return self.frozen.rvs(size=size, random_state=generator(rng))
+
+
+class Sampler:
+    """
+    Hands out values of a distribution one at a time, while drawing them from the distribution in blocks. Some
+    distributions (H, PH, Emp with a bandwidth) give other values for another size of the same stream, so arrays are
+    drawn in the same blocks as single values.
+    """
+
+    def __init__(self, distribution, rng=None, block=1024):
+        self.distribution = as_distribution(distribution)
+        self.rng = generator(rng)
+        self.block = block
+        self.buffer = []
+
+    def rvs(self, size=None):
+        """
+        Return the next value, or an array with the next values when a size is given
+        """
+
+        if size is not None:
+            n = int(np.prod(size))
+            rest = len(self.buffer) - min(n, len(self.buffer))
+            values = self.buffer[rest:][::-1]
+            del self.buffer[rest:]
+
+            missing = n - len(values)
+            if missing > 0:
+                drawn = np.concatenate([self.distribution.sample(self.block, self.rng)
+                                        for _ in range(-(-missing // self.block))])
+                values = np.r_[values, drawn[:missing]]
+                self.buffer = drawn[missing:][::-1].tolist()
+
+            return np.asarray(values, dtype=float).reshape(size)
+
+        if not self.buffer:
+            # reversed so that pop() hands out the values in the order in which they were drawn
+            self.buffer = self.distribution.sample(self.block, self.rng)[::-1].tolist()
+
+        return self.buffer.pop()
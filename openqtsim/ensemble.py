@@ -0,0 +1,87 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+import openqtsim
+
+
+def resample_state(t, values, grid):
+    """
+    Return the values of a step function (value[i] holds from t[i] until the next event) at the times in grid.
+    Events with equal times are resolved in the order in which they were logged.
+    """
+
+    t = np.asarray(t, dtype=float)
+    order = np.argsort(t, kind="stable")
+
+    index = np.searchsorted(t[order], grid, side="right") - 1
+
+    # before the first event the system is empty
+    return np.where(index >= 0, np.asarray(values)[order][np.maximum(index, 0)], 0)
+
+
+def replication(args):
+    """
+    Run one replication of a Task with the given seed and return c_s and c_q on the time grid
+    """
+
+    task, seed, grid = args
+
+    A = openqtsim.ArrivalProcess(task.A, arr_rate=task.lam)
+    S = openqtsim.ServiceProcess(task.S, srv_rate=task.mu / task.c)
+    sim = openqtsim.Simulation(openqtsim.Queue(A, S, task.c), seed=seed)
+    sim.run(task.nr_arr)
+
+    state = sim.system_state
+    c_s = resample_state(state["t"], state["c_s"], grid).astype(np.int32)
+    c_q = resample_state(state["t"], state["c_q"], grid).astype(np.int32)
+
+    return c_s, c_q
+
+
+def ensemble(task, n_rep, grid, seed=None, processes=None, quantiles=(0.05, 0.5, 0.95), thresholds=()):
+    """
+    Transient performance measures of a Task by averaging n_rep independent replications on a common time grid.
+    - grid: times (hours from the start of the simulation) at which the system state is evaluated; make sure
+      task.nr_arr is large enough for the simulation to cover the grid
+    - seed: seed of the ensemble (defaults to task.seed); each replication gets its own stream spawned from it
+    - processes: number of worker processes (None: all cores, 1: run in this process)
+    - quantiles: quantile bands to return for c_s and c_q
+    - thresholds: values x for which P(c_s > x) is returned as a function of time
+    Only the resampled states are returned by the replications, never the full logs.
+    """
+
+    grid = np.asarray(grid, dtype=float)
+    if seed is None:
+        seed = task.seed
+
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n_rep)]
+    args = [(task, s, grid) for s in seeds]
+
+    c_s = np.empty((n_rep, len(grid)), dtype=np.int32)
+    c_q = np.empty((n_rep, len(grid)), dtype=np.int32)
+
+    pool = multiprocessing.Pool(processes) if processes != 1 else None
+    try:
+        results = pool.imap(replication, args) if pool is not None else map(replication, args)
+
+        # the full logs stay in the workers, only the states on the grid are collected here
+        for i, (c_s_i, c_q_i) in enumerate(results):
+            c_s[i] = c_s_i
+            c_q[i] = c_q_i
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    df = pd.DataFrame({"t": grid, "c_s_mean": c_s.mean(axis=0), "c_q_mean": c_q.mean(axis=0)})
+
+    for name, values in (("c_s", c_s), ("c_q", c_q)):
+        for q, band in zip(quantiles, np.quantile(values, quantiles, axis=0)):
+            df["{}_q{:g}".format(name, 100 * q)] = band
+
+    for x in thresholds:
+        df["P(c_s>{:g})".format(x)] = (c_s > x).mean(axis=0)
+
+    return df
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+from scipy import special
+
+from openqtsim import distributions
+from openqtsim.arrival_process import ArrivalProcess
+from openqtsim.service_process import ServiceProcess
+
+
+class SufficientStatistics:
+    """
+    Running sums over observations from which the maximum likelihood fits of the exponential, Erlang, gamma and
+    lognormal distributions follow, so the observations can be streamed in chunks and never have to be in memory
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.sum = 0.
+        self.sum_log = 0.
+        self.sum_log_sq = 0.
+        self.min = np.inf
+
+    def update(self, chunk):
+        """
+        Add a chunk (array) of observations
+        """
+
+        x = np.asarray(chunk, dtype=float).ravel()
+        if not len(x):
+            return self
+
+        self.n += len(x)
+        self.sum += x.sum()
+        self.min = min(self.min, x.min())
+
+        # the log based fits require positive observations
+        if self.min > 0:
+            log_x = np.log(x)
+            self.sum_log += log_x.sum()
+            self.sum_log_sq += log_x @ log_x
+
+        return self
+
+    @property
+    def mean(self):
+        return self.sum / self.n
+
+    @property
+    def mean_log(self):
+        return self.sum_log / self.n
+
+
+def summarise(data, chunk_size=10 ** 6):
+    """
+    Return the SufficientStatistics of an array or of an iterable of arrays (e.g. chunks read from disk)
+    """
+
+    summary = SufficientStatistics()
+
+    if isinstance(data, (np.ndarray, pd.Series, list, tuple)):
+        data = np.asarray(data, dtype=float).ravel()
+        for start in range(0, len(data), chunk_size):
+            summary.update(data[start:start + chunk_size])
+    else:
+        for chunk in data:
+            summary.update(chunk)
+
+    return summary
+
+
+def _gamma_shape(s, iterations=5):
+    """
+    Maximum likelihood shape of the gamma distribution, with s = log(mean(x)) - mean(log(x)): Minka's approximation
+    followed by a few Newton steps
+    """
+
+    k = (3 - s + np.sqrt((s - 3) ** 2 + 24 * s)) / (12 * s)
+    for _ in range(iterations):
+        k = k - (np.log(k) - special.digamma(k) - s) / (1 / k - special.polygamma(1, k))
+
+    return k
+
+
+def _gamma_loglik(summary, k):
+    theta = summary.mean / k
+    return ((k - 1) * summary.sum_log - summary.sum / theta - summary.n * k * np.log(theta)
+            - summary.n * special.gammaln(k))
+
+
+def fit(data, candidates=("M", "E", "Gamma", "LN")):
+    """
+    Fit candidate distributions to observations (an array or an iterable of chunks) by maximum likelihood and
+    return them ranked by AIC, with columns: symbol, params, loglik, nr_params, mean, aic, bic and the fitted
+    distribution. The fitted mean is the sample mean for all candidates except the lognormal.
+    Candidates other than M are skipped when the observations contain values <= 0.
+    """
+
+    summary = data if isinstance(data, SufficientStatistics) else summarise(data)
+    n, mean = summary.n, summary.mean
+
+    rows = []
+
+    if "M" in candidates:
+        rows.append(("M", {}, -n * np.log(mean) - n, 1, mean))
+
+    if summary.min > 0:
+        s = np.log(mean) - summary.mean_log
+        shape = _gamma_shape(s) if s > 0 else np.inf
+
+        if "Gamma" in candidates and np.isfinite(shape):
+            rows.append(("Gamma", {"shape": shape}, _gamma_loglik(summary, shape), 2, mean))
+
+        if "E" in candidates and np.isfinite(shape):
+            # the best integer shape is one of the integers around the gamma shape; like for M only the mean is
+            # counted as a free parameter, E1 is M itself
+            k = max(1, int(np.floor(shape)))
+            k = max([k, k + 1], key=lambda k: _gamma_loglik(summary, k))
+            if k > 1:
+                rows.append(("E{}".format(k), {}, _gamma_loglik(summary, k), 1, mean))
+
+        if "LN" in candidates:
+            mu = summary.mean_log
+            sigma = np.sqrt(max(summary.sum_log_sq / n - mu ** 2, 0))
+            loglik = -summary.sum_log - n * np.log(sigma * np.sqrt(2 * np.pi)) - n / 2
+            rows.append(("LN", {"sigma": sigma}, loglik, 2, np.exp(mu + sigma ** 2 / 2)))
+
+    df = pd.DataFrame(rows, columns=["symbol", "params", "loglik", "nr_params", "mean"])
+    df["aic"] = 2 * df["nr_params"] - 2 * df["loglik"]
+    df["bic"] = np.log(n) * df["nr_params"] - 2 * df["loglik"]
+
+    df["distribution"] = [distributions.from_symbol(symbol, mean=m, **params)
+                          for symbol, params, m in zip(df["symbol"], df["params"], df["mean"])]
+
+    return df.sort_values("aic").reset_index(drop=True)
+
+
+def fit_arrival_process(IAT, candidates=("M", "E", "Gamma", "LN")):
+    """
+    Return the ArrivalProcess of the best fitting distribution (lowest AIC) of observed inter arrival times
+    """
+
+    best = fit(IAT, candidates).iloc[0]
+
+    return ArrivalProcess(best["symbol"], arr_rate=1 / best["mean"], **best["params"])
+
+
+def fit_service_process(ST, candidates=("M", "E", "Gamma", "LN")):
+    """
+    Return the ServiceProcess of the best fitting distribution (lowest AIC) of observed service times
+    """
+
+    best = fit(ST, candidates).iloc[0]
+
+    return ServiceProcess(best["symbol"], srv_rate=1 / best["mean"], **best["params"])
@@ -0,0 +1,85 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from openqtsim.distributions import Sampler, spawn_streams
+
+
+def simulate(queue, nr_arr, seed=None, schedule=None, IAT=None, ST=None):
+    """
+    Simulate a FIFO G/G/c queue without SimPy: the servers are kept in a heap ordered by the time they become free,
+    so every customer costs O(log c). Returns the customer log with the same columns as Simulation.return_log.
+    - queue: Queue object (the service rate may differ per server)
+    - nr_arr: nr of arrivals
+    - seed: random seed, the random streams are the same as those of a Simulation with the same seed
+    - schedule: CapacitySchedule with shifts and breakdowns of the servers (None: always available); the breakdowns
+      are drawn from the streams of the seed
+    - IAT, ST: given inter arrival times and service times per customer instead of drawing them
+    Among the free servers the one that has been free the longest is chosen, like the "fifo" policy of ServerPool.
+    """
+
+    c = queue.c
+    if schedule is not None:
+        schedule.check(c)
+    streams = spawn_streams(seed, c)
+
+    if IAT is None:
+        IAT = Sampler(queue.A.get_distribution(), streams["arrival"]).rvs(nr_arr)
+    IAT = np.asarray(IAT, dtype=float)[:nr_arr]
+    AT = np.cumsum(IAT).tolist()
+
+    availability = schedule.start(streams["breakdowns"]) if schedule is not None else None
+
+    if ST is None:
+        samplers = {i: Sampler(queue.S.get_distribution(i), streams["servers"][i]) for i in range(1, c + 1)}
+    else:
+        ST = np.asarray(ST, dtype=float)[:nr_arr].tolist()
+
+    heap = [(0., i) for i in range(1, c + 1)]  # (time the server is free, s_id)
+    last_active = [0.] * (c + 1)
+
+    n = len(AT)
+    log_ST, TSB, TSE, ITS, s_ids = [0.] * n, [0.] * n, [0.] * n, [0.] * n, [0] * n
+
+    for i in range(n):
+        at = AT[i]
+
+        while True:
+            if not heap:
+                raise ValueError("No server is available anymore for customer {}".format(i + 1))
+
+            free, s_id = heapq.heappop(heap)
+            start = free if free > at else at
+
+            if availability is not None:
+                # a server that is not available at the start time goes back into the heap with its next up time
+                up = availability.next_up(s_id, start)
+                if up > start:
+                    if up < np.inf:
+                        heapq.heappush(heap, (up, s_id))
+                    continue
+            break
+
+        st = ST[i] if ST is not None else samplers[s_id].rvs()
+        end = start + st
+
+        log_ST[i], TSB[i], TSE[i], ITS[i], s_ids[i] = st, start, end, start - last_active[s_id], s_id
+        last_active[s_id] = end
+        heapq.heappush(heap, (end, s_id))
+
+    AT = np.array(AT)
+    TSB = np.array(TSB)
+    TSE = np.array(TSE)
+
+    return pd.DataFrame({
+        "c_id": np.arange(1, n + 1),
+        "IAT": IAT,
+        "ST": log_ST,
+        "AT": AT,
+        "TSB": TSB,
+        "TSE": TSE,
+        "TCSS": TSE - AT,
+        "TCWQ": TSB - AT,
+        "ITS": ITS,
+        "s_id": s_ids})
@@ -1,4 +1,3 @@
-from scipy import stats
 import numpy as np
 import pandas as pd
 
@@ -15,26 +14,23 @@ class MM1:
         Initialization the basic time unit is hours.
         """
 
-        # todo: consider to remove seed
         self.lam = lam  # arrivals per hour
         self.mu = mu  # departures per hour
         self.nr_arr = nr_arr  # nr of customers
 
-        np.random.seed(seed)
+        # random stream owned by this object instead of the global numpy random state
+        self.rng = np.random.default_rng(seed)
 
     def get_IAT_and_ST(self):  # generate list of inter arrival times
         """
         Generate lists of IAT's and ST's drawn from exponential distributions.
         """
 
-        rv_iat = stats.expon(scale=1 / self.lam)
-        rv_st = stats.expon(scale=1 / self.mu)
-
         # generate list of inter arrival times
-        IAT = rv_iat.rvs(self.nr_arr)
+        IAT = self.rng.exponential(1 / self.lam, self.nr_arr)
 
         # generate list of service times
-        ST = rv_st.rvs(self.nr_arr)
+        ST = self.rng.exponential(1 / self.mu, self.nr_arr)
 
         return IAT, ST
 
@@ -1,8 +1,14 @@
-import openqtsim
-import numpy as np
+import multiprocessing
+import time
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
-Task = namedtuple('Task', 'A, S, c, nr_arr, lam, mu')
+import numpy as np
+import pandas as pd
+
+import openqtsim
+
+Task = namedtuple('Task', 'A, S, c, nr_arr, lam, mu, seed', defaults=[None])
 
 
 def worker(task:Task):
@@ -18,13 +24,103 @@ def worker(task:Task):
     q = openqtsim.Queue(A, S, c)
 
     # use the queue object to create a simulation object and run simulation with the specified number of arrivals
-    sim = openqtsim.Simulation(q)
+    sim = openqtsim.Simulation(q, seed=task.seed)
     sim.run(task.nr_arr)
 
     # retrieve the logs (df1: customer log, df2: system log)
     df1, df2 = sim.return_log()
 
-    # use the customer log to determine the average waiting time as a factor of service time 
+    # use the customer log to determine the average waiting time as a factor of service time
     factor = np.mean(df1["TCWQ"]) / np.mean(df1["ST"])
 
     return factor
+
+
+def heap_worker(task:Task):
+    # same as worker, but with the heap based engine instead of SimPy
+    A = openqtsim.ArrivalProcess(task.A, arr_rate=task.lam)
+    S = openqtsim.ServiceProcess(task.S, srv_rate=task.mu/task.c)
+    q = openqtsim.Queue(A, S, task.c)
+
+    df1 = openqtsim.heap_engine.simulate(q, task.nr_arr, seed=task.seed)
+
+    factor = np.mean(df1["TCWQ"]) / np.mean(df1["ST"])
+
+    return factor
+
+
+def batch_worker(tasks):
+    """
+    Return the waiting factors of a list of single server Tasks with one vectorized call per (A, S) combination.
+    The result of a Task with a seed does not depend on the other Tasks in the list.
+    """
+
+    tasks = list(tasks)
+    df = pd.DataFrame(tasks, columns=Task._fields)
+    if np.any(df["c"] != 1):
+        raise ValueError("The batch engine only simulates single server queues")
+
+    factors = np.empty(len(df))
+    for (A, S), group in df.groupby(["A", "S"]):
+        # tasks with a seed get their own stream, tasks without one draw from fresh entropy; the seeds are taken from
+        # the tasks, the column of the frame is float when a seed is missing and rounds seeds above 2 ** 53
+        seed = [tasks[i].seed for i in group.index]
+        if all(s is None for s in seed):
+            seed = None
+        factors[group.index] = openqtsim.worker_batch(group["lam"], group["mu"], group["nr_arr"], A, S, seed=seed)
+
+    return factors.tolist()
+
+
+engines = {"simpy": worker, "heap": heap_worker}
+
+
+def run_tasks(tasks, engine="simpy", max_workers=None, executor="thread", chunksize=None):
+    """
+    Run a list of Tasks and return the results in the same order.
+    - engine: "simpy" (worker), "heap" (heap_worker), "batch" (batch_worker, single server only) or a function
+    - max_workers: nr of threads or processes (None: nr of cores)
+    - executor: "thread" runs the tasks in a thread pool within this process, "process" in a multiprocessing pool
+    Simulations own their random streams and hold no global state, so they can run concurrently in threads. NumPy
+    releases the GIL inside its kernels (the batch engine) and on free-threaded builds of python the SimPy and heap
+    engines run in parallel as well; with the GIL the threads only avoid the start-up and pickling costs of processes.
+    """
+
+    tasks = list(tasks)
+    max_workers = max_workers or multiprocessing.cpu_count()
+
+    if engine == "batch":
+        # the batch engine is vectorized over tasks, so every worker gets one chunk of tasks
+        chunksize = chunksize or -(-len(tasks) // max_workers)
+        chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+        results = run_tasks(chunks, batch_worker, max_workers, executor, chunksize=1)
+        return [factor for chunk in results for factor in chunk]
+
+    func = engines.get(engine, engine)
+    chunksize = chunksize or 1
+
+    if executor == "thread":
+        with ThreadPoolExecutor(max_workers) as pool:
+            return list(pool.map(func, tasks))
+
+    elif executor == "process":
+        with multiprocessing.Pool(max_workers) as pool:
+            return pool.map(func, tasks, chunksize=chunksize)
+
+    raise ValueError("Unknown executor '{}', choose 'thread' or 'process'".format(executor))
+
+
+def benchmark(tasks, engines=("simpy", "heap"), executors=("thread", "process"), max_workers=None):
+    """
+    Return a dataframe with the wall clock time and throughput (tasks per second) of each engine and executor
+    """
+
+    rows = []
+    for engine in engines:
+        for executor in executors:
+            start = time.perf_counter()
+            run_tasks(tasks, engine, max_workers, executor)
+            duration = time.perf_counter() - start
+            rows.append((engine, executor, duration, len(tasks) / duration))
+
+    return pd.DataFrame(rows, columns=["engine", "executor", "seconds", "tasks_per_second"])
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+# seaborn and matplotlib are imported by the plot functions only, they take longer to import than the simulation
+# engines themselves
+
+
+def read_log(source, columns=None, chunksize=2 ** 20):
+    """
+    Yield a log in chunks of at most chunksize rows, so that logs that do not fit in memory can be plotted.
+    - source: dataframe, or path of a csv or parquet file (reading parquet requires pyarrow)
+    - columns: columns to read (None: all)
+    """
+
+    if isinstance(source, pd.DataFrame):
+        yield source if columns is None else source[list(columns)]
+        return
+
+    path = str(source)
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading parquet logs requires pyarrow, use a csv file otherwise")
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def _reduce(t, values, t0, width, n_buckets):
+    """
+    Return per bucket with records (bucket, first time, minimum, maximum, last value), for t in order of time and
+    buckets of the given width from t0 on
+    """
+
+    bucket = np.clip(((t - t0) / width).astype(np.int64), 0, n_buckets - 1)
+
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(t)] - 1
+
+    return bucket[starts], t[starts], np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts), \
+        values[ends]
+
+
+def decimate_step(t, values, n_buckets=2000):
+    """
+    Reduce a step function (t in order of time) for plotting: the time axis is split into n_buckets equal buckets
+    (about one per pixel) and every bucket keeps its minimum, maximum and last value, stamped at the first time in
+    the bucket. Drawn as steps this covers the same pixels as the full trace. Returns (t, values).
+    """
+
+    t = np.asarray(t, dtype=float)
+    values = np.asarray(values)
+    if len(t) <= 3 * n_buckets:
+        return t, values
+
+    width = (t[-1] - t[0]) / n_buckets or 1.
+    _, first, low, high, last = _reduce(t, values, t[0], width, n_buckets)
+
+    return np.repeat(first, 3), np.column_stack([low, high, last]).ravel()
+
+
+def decimate_trace(source, columns=("c_s", "c_q"), n_buckets=2000, chunksize=2 ** 20):
+    """
+    Return a dataframe with column t and the decimated columns of a system state log (see decimate_step). A first
+    pass finds the time range of the log; the chunks are then reduced on the same buckets and the minima, maxima and
+    last values are merged per bucket, so the result does not depend on the chunksize.
+    """
+
+    n, t0, t1 = 0, np.inf, -np.inf
+    for chunk in read_log(source, ["t"], chunksize):
+        if len(chunk):
+            n, t0, t1 = n + len(chunk), min(t0, chunk["t"].min()), max(t1, chunk["t"].max())
+
+    if n <= 3 * n_buckets:
+        return pd.concat(read_log(source, ["t", *columns], chunksize), ignore_index=True)
+
+    width = (t1 - t0) / n_buckets or 1.
+    first = np.full(n_buckets, np.nan)
+    low = {column: np.full(n_buckets, np.inf) for column in columns}
+    high = {column: np.full(n_buckets, -np.inf) for column in columns}
+    last = {column: np.zeros(n_buckets) for column in columns}
+    dtypes = {}
+
+    for chunk in read_log(source, ["t", *columns], chunksize):
+        if not len(chunk):
+            continue
+        t = chunk["t"].to_numpy(dtype=float)
+
+        for column in columns:
+            values = chunk[column].to_numpy()
+            dtypes[column] = values.dtype
+            bucket, first_t, low_i, high_i, last_i = _reduce(t, values, t0, width, n_buckets)
+            low[column][bucket] = np.minimum(low[column][bucket], low_i)
+            high[column][bucket] = np.maximum(high[column][bucket], high_i)
+            last[column][bucket] = last_i
+
+        # the chunks are in order of time, so a bucket keeps the first time of the first chunk that reaches it
+        first[bucket] = np.where(np.isnan(first[bucket]), first_t, first[bucket])
+
+    used = ~np.isnan(first)
+    result = {"t": np.repeat(first[used], 3)}
+    for column in columns:
+        values = np.column_stack([low[column][used], high[column][used], last[column][used]]).ravel()
+        result[column] = values.astype(dtypes[column])
+
+    return pd.DataFrame(result)
+
+
+def histogram_counts(source, column, bins=50, value_range=None, chunksize=2 ** 20):
+    """
+    Histogram of a column of a log, counted per chunk. Returns (counts, edges, mean).
+    - value_range: (lower, upper) of the bins; None takes the minimum and maximum of the column (an extra pass)
+    """
+
+    if value_range is None:
+        lower, upper = np.inf, -np.inf
+        for chunk in read_log(source, [column], chunksize):
+            lower, upper = min(lower, chunk[column].min()), max(upper, chunk[column].max())
+        value_range = (lower, upper)
+
+    edges = np.histogram_bin_edges([], bins=bins, range=value_range)
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    total, n = 0., 0
+
+    for chunk in read_log(source, [column], chunksize):
+        values = chunk[column].to_numpy(dtype=float)
+        counts += np.histogram(values, bins=edges)[0]
+        total += values.sum()
+        n += len(values)
+
+    return counts, edges, total / n
+
+
+def plot_system_state(source, n_buckets=2000, fontsize=20, chunksize=2 ** 20):
+    """
+    Plot number of customers in the system and in the queue as a function of time
+    - source: system state log (dataframe or path of a csv or parquet file with columns t, c_s and c_q)
+    """
+
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    df = decimate_trace(source, ("c_s", "c_q"), n_buckets, chunksize)
+
+    sns.set(style="white", palette="muted", color_codes=True)
+
+    # Set up the matplotlib figure
+    fig, ax = plt.subplots(figsize=(14, 7))
+    sns.despine(left=True)
+
+    ax.step(df["t"], df["c_s"], where="post", color="b", label="Nr. cust. in system")
+    ax.step(df["t"], df["c_q"], where="post", color="r", label="Nr. cust. in queue")
+    ax.legend()
+
+    # set labels
+    ax.set_xlabel("Time (hours)", fontsize=fontsize)
+    ax.set_ylabel("Nr. of customers", fontsize=fontsize)
+    ax.tick_params(labelsize=fontsize)
+
+    return fig, ax
+
+
+def plot_IAT_ST(source, bins=50, fontsize=20, chunksize=2 ** 20):
+    """
+    Plot histograms of IAT's and ST's with a line at their mean
+    - source: customer log (dataframe or path of a csv or parquet file with columns IAT and ST)
+    """
+
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    sns.set(style="white", palette="muted", color_codes=True)
+
+    # Set up the matplotlib figure
+    fig, axes = plt.subplots(1, 2, figsize=(14, 7), sharex=True)
+    sns.despine(left=True)
+
+    for ax, column, label in zip(axes, ["IAT", "ST"], ["Inter arrival times", "Service times"]):
+        counts, edges, mean = histogram_counts(source, column, bins, chunksize=chunksize)
+        ax.stairs(counts, edges, fill=True, color="b", alpha=0.6)
+        ax.axvline(mean, linewidth=3, color="k")
+
+        # set labels
+        ax.set_xlabel(label, fontsize=fontsize)
+        ax.set_ylabel("Nr. of customers", fontsize=fontsize)
+        ax.tick_params(labelsize=fontsize)
+
+    plt.tight_layout()
+
+    return fig, axes
@@ -40,7 +40,7 @@ class Queue:
         while Sim.customer_nr < Sim.max_arr:
 
             # Draw IAT from distribution, move time forward and register arrival time (AT)
-            IAT = Sim.queue.A.get_IAT(Sim.customer_nr)
+            IAT = Sim.queue.A.get_IAT(Sim.arrival_distribution, Sim.customer_nr)
 
             yield Env.timeout(IAT)
 
@@ -0,0 +1,253 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy import optimize, stats
+
+from openqtsim import distributions
+
+TailEstimate = namedtuple('TailEstimate', 'probability, std_err, ci_low, ci_high, theta, customers')
+
+
+def _gamma_parameters(distribution):
+    """
+    Return (shape, rate) of an exponential, Erlang or gamma distribution
+    """
+
+    if isinstance(distribution, distributions.Exponential):
+        shape = 1.
+    elif isinstance(distribution, distributions.Erlang):
+        shape = float(distribution.k)
+    elif isinstance(distribution, distributions.Gamma):
+        shape = float(distribution.shape)
+    else:
+        raise ValueError("Exponential twisting is implemented for exponential, Erlang and gamma distributions, "
+                         "not for {}".format(type(distribution).__name__))
+
+    return shape, shape / distribution.mean
+
+
+def twisting_parameter(queue):
+    """
+    Return theta* > 0 that solves E[exp(theta * (ST - IAT))] = 1 for a single server queue (the decay rate of the
+    tail of the waiting time distribution). For M/M/1 this is mu - lambda.
+    """
+
+    if queue.c != 1:
+        raise ValueError("Exponential twisting of the waiting time is only defined for a single server, use "
+                         "splitting_tail for c > 1")
+
+    a_A, r_A = _gamma_parameters(queue.A.get_distribution())
+    a_S, r_S = _gamma_parameters(queue.S.get_distribution())
+
+    if a_A / r_A <= a_S / r_S:
+        raise ValueError("The queue is not stable: the mean service time exceeds the mean inter arrival time")
+
+    if a_A == 1 and a_S == 1:
+        return float(r_S - r_A)
+
+    # log of the moment generating function of ST - IAT; convex, zero at 0 and at theta*, to infinity at r_S
+    def log_mgf(theta):
+        return a_S * np.log(r_S / (r_S - theta)) + a_A * np.log(r_A / (r_A + theta))
+
+    upper = r_S * (1 - 1e-12)
+    while log_mgf(upper) <= 0:
+        upper = (upper + r_S) / 2
+
+    return float(optimize.brentq(log_mgf, r_S * 1e-9, upper, xtol=1e-14 * r_S))
+
+
+def waiting_tail(queue, x, n_rep=1000, seed=None, alpha=0.05, block=64):
+    """
+    Estimate P(W_q > x), the probability that a customer waits longer than x in a stationary single server queue
+    with exponential, Erlang or gamma inter arrival and service times, with importance sampling (Siegmund's
+    exponential twisting). The waiting time exceeds x if the random walk of ST - IAT ever rises above x. Under the
+    twisted distributions (service times faster by theta*, inter arrival times slower) the walk drifts upwards, so
+    every replication crosses x after about x / drift customers, and exp(-theta* S) at the crossing is an
+    unbiased estimate with bounded relative error for any x. For multi server queues and other distributions see
+    splitting_tail.
+    - n_rep: nr of replications
+    - alpha: the confidence interval covers 1 - alpha
+    Returns a TailEstimate, with the total nr of simulated customers.
+    """
+
+    theta = twisting_parameter(queue)
+    a_A, r_A = _gamma_parameters(queue.A.get_distribution())
+    a_S, r_S = _gamma_parameters(queue.S.get_distribution())
+
+    # the twisted distributions stay in the gamma family, with rates r_A + theta and r_S - theta
+    arrival = distributions.Gamma(a_A / (r_A + theta), a_A)
+    service = distributions.Gamma(a_S / (r_S - theta), a_S)
+
+    rng = distributions.generator(seed)
+
+    walk = np.zeros(n_rep)
+    overshoot = np.empty(n_rep)
+    active = np.arange(n_rep)
+    customers = 0
+
+    while len(active):
+        steps = service.sample((len(active), block), rng) - arrival.sample((len(active), block), rng)
+        paths = walk[active, None] + np.cumsum(steps, axis=1)
+
+        crossed = paths > x
+        hit = crossed.any(axis=1)
+        first = crossed.argmax(axis=1)
+
+        overshoot[active[hit]] = paths[hit, first[hit]]
+        customers += int(np.sum(first[hit] + 1)) + block * int(np.sum(~hit))
+
+        walk[active[~hit]] = paths[~hit, -1]
+        active = active[~hit]
+
+    # likelihood ratio of the twisted walk at the crossing
+    values = np.exp(-theta * overshoot)
+
+    probability = float(values.mean())
+    std_err = float(values.std(ddof=1) / np.sqrt(n_rep))
+    z = float(stats.norm.ppf(1 - alpha / 2))
+
+    return TailEstimate(probability, std_err, probability - z * std_err, probability + z * std_err, theta, customers)
+
+
+
+def _step(state, w, arrival, service, rng):
+    """
+    Return the sorted workload vectors (paths, c) seen by the next arriving customers, for the workload vectors seen
+    by the current ones (who wait w, the smallest workload), in place (the Kiefer-Wolfowitz recursion of a FIFO G/G/c
+    queue)
+    """
+
+    state[:, 0] = w + service.sample(len(state), rng)
+    state -= arrival.sample(len(state), rng)[:, None]
+    np.maximum(state, 0, out=state)
+    state.sort(axis=1)
+
+    return state
+
+
+def _run(states, warm_up, steps, arrival, service, rng, floor=np.inf):
+    """
+    Run warm_up and then steps customers on every path (the rows of states). Returns (waiting times of the steps
+    customers per path, workload vectors of the customers that wait longer than floor while the one before did not)
+    """
+
+    state = np.array(states, dtype=float)
+    W = np.empty((len(state), steps))
+    entrances = []
+
+    prev = np.full(len(state), np.inf)
+    for k in range(warm_up + steps):
+        w = state[:, 0].copy()
+        if k >= warm_up:
+            W[:, k - warm_up] = w
+            entrances.append(state[(w > floor) & (prev <= floor)])
+        prev = w
+        _step(state, w, arrival, service, rng)
+
+    return W, np.concatenate(entrances)
+
+
+def _excursions(states, floor, arrival, service, rng, level=np.inf, x=np.inf):
+    """
+    Run paths from the given workload vectors until an arriving customer waits longer than level, or at most floor
+    (the end of the excursion above floor). Returns (workload vectors of the paths that exceeded level, maximum
+    waiting time per path, nr of customers per path that waited longer than x, nr of customers)
+    """
+
+    state = np.array(states, dtype=float)
+    maxima, counts = np.zeros(len(state)), np.zeros(len(state))
+    entrances = []
+    customers = 0
+
+    active = np.arange(len(state))
+    while len(active):
+        s = state[active]
+        w = s[:, 0].copy()
+        maxima[active] = np.maximum(maxima[active], w)
+
+        reached = w > level
+        entrances.append(s[reached])
+
+        go = ~reached & (w > floor)
+        active, s, w = active[go], s[go], w[go]
+        counts[active] += w > x
+        customers += len(active)
+
+        state[active] = _step(s, w, arrival, service, rng)
+
+    return np.concatenate(entrances), maxima, counts, customers
+
+
+def splitting_tail(queue, x, effort=1000, n_rep=10, seed=None, alpha=0.05, p_stage=0.2, warm_up=1000, steps=200,
+                   max_levels=100):
+    """
+    Estimate P(W_q > x), the probability that a customer waits longer than x in a stationary FIFO G/G/c queue with
+    identical servers and any inter arrival and service time distribution, with fixed effort multilevel splitting
+    on the waiting time of arriving customers (the smallest workload of the servers).
+    A crude run of effort paths (after warm_up customers, steps customers each) gives the rate r of the excursions
+    of the waiting time above a base level l_0 that about p_stage of the customers exceed, and the workloads at their
+    start. Customers that wait longer than x only occur within these excursions, so P(W_q > x) = r * E[customers
+    with W_q > x per excursion]. The expectation is estimated in stages: effort paths run from the starting states of
+    the previous level until a customer waits longer than the next level or the excursion ends, and the fraction that
+    gets there multiplies the estimate. From the last level (x) on, the customers that wait longer than x are counted
+    until the excursion ends. The levels are chosen in a pilot run, such that about p_stage of the paths reach the
+    next level.
+    - effort: nr of paths of the crude run and of each stage
+    - n_rep: nr of independent replications, which give the standard error and the confidence interval
+    - alpha: the confidence interval covers 1 - alpha
+    - warm_up, steps: nr of customers per path of the crude run before and after it is stationary
+    Returns a TailEstimate (theta is None), with the total nr of simulated customers.
+    """
+
+    if queue.A.symbol == "D" or queue.S.symbol == "D" or np.ndim(queue.S.srv_rate):
+        raise ValueError("Splitting requires identical servers and inter arrival and service time distributions")
+
+    arrival, service, c = queue.A.get_distribution(), queue.S.get_distribution(), queue.c
+    if service.mean >= c * arrival.mean:
+        raise ValueError("The queue is not stable: the utilisation of the servers is not below 1")
+
+    pilot, *streams = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_rep + 1)]
+    empty = np.zeros((effort, c))
+
+    # pilot: the base level and every next level are the (1 - p_stage) quantile of the waiting times that are reached
+    W, _ = _run(empty, warm_up, steps, arrival, service, pilot)
+    floor = min(x, float(np.quantile(W, 1 - p_stage)))
+    _, entrances = _run(empty, warm_up, steps, arrival, service, pilot, floor)
+    customers = 2 * effort * (warm_up + steps)
+
+    levels = []
+    while levels[-1:] != [x] and len(entrances):
+        states = entrances[pilot.integers(len(entrances), size=effort)]
+        _, maxima, _, more = _excursions(states, floor, arrival, service, pilot, level=x)
+        levels.append(x if len(levels) == max_levels - 1 else min(x, float(np.quantile(maxima, 1 - p_stage))))
+        entrances, _, _, again = _excursions(states, floor, arrival, service, pilot, level=levels[-1])
+        customers += more + again
+
+    values = np.zeros(n_rep)
+    for i, rng in enumerate(streams):
+        _, entrances = _run(empty, warm_up, steps, arrival, service, rng, floor)
+        customers += effort * (warm_up + steps)
+        probability = len(entrances) / (effort * steps)
+
+        for level in levels + [None]:
+            if not len(entrances):
+                probability = 0.
+                break
+            states = entrances[rng.integers(len(entrances), size=effort)]
+
+            if level is None:
+                _, _, counts, more = _excursions(states, floor, arrival, service, rng, x=x)
+                probability *= counts.mean()
+            else:
+                entrances, _, _, more = _excursions(states, floor, arrival, service, rng, level=level)
+                probability *= len(entrances) / effort
+            customers += more
+
+        values[i] = probability
+
+    # the estimates of the replications are skewed, the t distribution gives a better coverage for few replications
+    probability = float(values.mean())
+    std_err = float(values.std(ddof=1) / np.sqrt(n_rep))
+    z = float(stats.t.ppf(1 - alpha / 2, n_rep - 1))
+
+    return TailEstimate(probability, std_err, probability - z * std_err, probability + z * std_err, None, customers)
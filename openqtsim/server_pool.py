@@ -0,0 +1,147 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+
+class ServerPool:
+    """
+    Pool of servers for the SimPy engine (replaces simpy.FilterStore). Customers get a server in order of request;
+    which free server they get depends on the assignment policy:
+    - "fifo": the server that has been free the longest (the behaviour of the FilterStore)
+    - "fastest": the free server with the highest service rate
+    - "random": a random free server
+    - "round_robin": the first free server after the one that was assigned last (in order of id)
+    Each policy keeps the free servers in its own structure, so picking a server costs at most O(log c).
+    With the Availability of a CapacitySchedule, servers that are off shift or broken down are parked until they are
+    available again.
+    """
+
+    policies = ("fifo", "fastest", "random", "round_robin")
+
+    def __init__(self, env, servers=(), policy="fifo", rng=None, availability=None):
+        """
+        env: simpy environment
+        servers: servers (with an id and srv_rate) that are free at the start
+        policy: assignment policy, one of ServerPool.policies
+        rng: numpy random Generator for the random policy
+        availability: Availability of the servers in this run, see CapacitySchedule.start (None: always available)
+        """
+
+        if policy not in self.policies:
+            raise ValueError("Unknown assignment policy '{}', choose from {}".format(policy, self.policies))
+
+        self.env = env
+        self.policy = policy
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.availability = availability
+        self.waiting = deque()  # get events of customers waiting for a server
+
+        self.free = deque() if policy == "fifo" else []
+        self.behind = []  # round robin: free servers with an id before the last assigned one
+        self.last_id = 0
+
+        for server in servers:
+            self._push(server)
+
+    def __len__(self):
+        """
+        Nr of free servers
+        """
+
+        return len(self.free) + len(self.behind)
+
+    @property
+    def items(self):
+        """
+        List of the free servers
+        """
+
+        if self.policy in ("fastest", "round_robin"):
+            return [entry[-1] for entry in self.free + self.behind]
+
+        return list(self.free)
+
+    def _push(self, server):
+        if self.policy == "fifo" or self.policy == "random":
+            self.free.append(server)
+
+        elif self.policy == "fastest":
+            heapq.heappush(self.free, (-server.srv_rate, server.id, server))
+
+        elif self.policy == "round_robin":
+            heapq.heappush(self.free if server.id > self.last_id else self.behind, (server.id, server))
+
+    def _pop(self):
+        if self.policy == "fifo":
+            return self.free.popleft()
+
+        elif self.policy == "random":
+            # swap a random server to the end of the list and remove it there
+            i = self.rng.integers(len(self.free))
+            self.free[i], self.free[-1] = self.free[-1], self.free[i]
+            return self.free.pop()
+
+        elif self.policy == "fastest":
+            return heapq.heappop(self.free)[-1]
+
+        elif self.policy == "round_robin":
+            # no free server after the last assigned one: start again at the lowest id
+            if not self.free:
+                self.free, self.behind = self.behind, self.free
+            # the servers that stay in self.free all have a higher id than the popped one
+            server = heapq.heappop(self.free)[-1]
+            self.last_id = server.id
+            return server
+
+    def get(self):
+        """
+        Return an event that succeeds with a server as soon as one is available for this customer
+        """
+
+        event = self.env.event()
+
+        while not self.waiting and len(self):
+            server = self._pop()
+            if self._available(server):
+                return event.succeed(server)
+
+        self.waiting.append(event)
+
+        return event
+
+    def put(self, server):
+        """
+        Return a server to the pool; a waiting customer gets it directly (if the server is available)
+        """
+
+        if self._available(server):
+            if self.waiting:
+                self.waiting.popleft().succeed(server)
+            else:
+                self._push(server)
+
+        return self.env.event().succeed()
+
+    def _available(self, server):
+        """
+        Return whether the server can start a service now; if not it is parked until it can
+        """
+
+        if self.availability is None:
+            return True
+
+        # the simulation clock starts at the epoch (about 1.7e9), which limits the resolution of now to about
+        # 1e-7 hours; without a tolerance a parked server could wake up just before its up time and park again
+        now = self.env.now - getattr(self.env, "epoch", 0)
+        up = self.availability.next_up(server.id, now)
+        if up > now + 1e-6:
+            if up < float("inf"):
+                self.env.process(self._return_at(server, up - now))
+            return False
+
+        return True
+
+    def _return_at(self, server, delay):
+        yield self.env.timeout(delay)
+        self.put(server)
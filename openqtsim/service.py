@@ -0,0 +1,267 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from openqtsim.cli import task_from_dict
+from openqtsim.mt_engine import Task, batch_worker, engines
+from openqtsim.sweep import scenario_hash
+
+reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def run_chunk(engine, tasks):
+    """
+    Return the waiting factors of a chunk of Tasks, computed in one call of a pool worker
+    """
+
+    if engine == "batch":
+        return batch_worker(tasks)
+
+    return [engines[engine](task) for task in tasks]
+
+
+class SimulationService:
+    """
+    Local HTTP service that runs scenarios (Tasks) as JSON requests, with only the python standard library:
+    - POST /run with a Task ({"A": "M", "S": "M", "c": 1, "nr_arr": 1000, "lam": 4, "mu": 5, "seed": 1}) or a list
+      of Tasks returns {"results": [{"hash": .., "waiting_factor": .., "cached": ..}, ..]}
+    - GET /health returns the size of the cache and the nr of batches run so far
+    The worker pool is started (and warmed up) with the service, so requests do not pay for start-up and imports.
+    Requests that arrive within batch_delay seconds of each other are coalesced into one batch, which is split into
+    one chunk per worker. Results of seeded scenarios are kept in an LRU cache keyed by the scenario hash, and a
+    seeded scenario that is already running is not started twice.
+    """
+
+    def __init__(self, engine="heap", max_workers=None, executor="process", batch_delay=0.005, max_batch=1024,
+                 cache_size=10000):
+        """
+        engine: "simpy", "heap" or "batch" (see mt_engine.run_tasks)
+        max_workers: nr of processes or threads of the pool (None: nr of cores)
+        executor: "process" or "thread"
+        batch_delay: time (s) to wait for other requests before a batch is run
+        max_batch: a batch is run without delay once it has this many scenarios
+        cache_size: nr of results in the LRU cache
+        """
+
+        if engine not in ("simpy", "heap", "batch"):
+            raise ValueError("Unknown engine '{}', choose 'simpy', 'heap' or 'batch'".format(engine))
+
+        self.engine = engine
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.executor = executor
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+
+        self.cache = OrderedDict()
+        self.running = {}  # hash: future of a scenario that is pending or running
+        self.pending = []  # (hash, task, future) of the next batch, hash None for a task without a seed
+        self.flush_handle = None
+        self.batches = 0
+
+        self.pool = None
+        self.server = None
+        self.port = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Start the worker pool and the HTTP server; port 0 picks a free port (see self.port)
+        """
+
+        if self.executor == "process":
+            self.pool = ProcessPoolExecutor(self.max_workers)
+        elif self.executor == "thread":
+            self.pool = ThreadPoolExecutor(self.max_workers)
+        else:
+            raise ValueError("Unknown executor '{}', choose 'thread' or 'process'".format(self.executor))
+
+        # warm up every worker with a small scenario
+        loop = asyncio.get_running_loop()
+        warm_up = [Task("M", "M", 1, 10, 4, 5, 1)]
+        await asyncio.gather(*[loop.run_in_executor(self.pool, run_chunk, self.engine, warm_up)
+                               for _ in range(self.max_workers)])
+
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+        return self.server
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    async def serve_forever(self, host="127.0.0.1", port=8080):
+        await self.start(host, port)
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def run(self, tasks):
+        """
+        Return [(hash, waiting factor, cached)] for a list of Tasks. Tasks without a seed are drawn from fresh
+        entropy, so they are run every time and not cached.
+        """
+
+        loop = asyncio.get_running_loop()
+        keys = [scenario_hash(task) for task in tasks]
+        found = {}
+        futures = []  # per task its future, or None for a cached result
+
+        for key, task in zip(keys, tasks):
+            future = None
+            if task.seed is None:
+                future = loop.create_future()
+                self.pending.append((None, task, future))
+            elif key in self.cache:
+                self.cache.move_to_end(key)
+                found[key] = self.cache[key]
+            elif key in self.running:
+                future = self.running[key]
+            else:
+                future = self.running[key] = loop.create_future()
+                self.pending.append((key, task, future))
+            futures.append(future)
+
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.pending and self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.batch_delay, self.flush)
+
+        # the futures are collected before the first await, a finished chunk removes its keys from self.running
+        values = await asyncio.gather(*[future for future in futures if future is not None])
+        values = iter(values)
+
+        return [(key, found[key], True) if future is None else (key, next(values), False)
+                for key, future in zip(keys, futures)]
+
+    def flush(self):
+        """
+        Run the pending scenarios as one batch, split into one chunk per worker
+        """
+
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+
+        self.batches += 1
+        size = -(-len(batch) // self.max_workers)
+        for i in range(0, len(batch), size):
+            asyncio.ensure_future(self.run_batch(batch[i:i + size]))
+
+    async def run_batch(self, batch):
+        """
+        Run a chunk of (hash, task, future) and set the futures; if the chunk fails, its tasks are run one at a time,
+        so that a bad task of one request does not fail the tasks of other requests
+        """
+
+        loop = asyncio.get_running_loop()
+        keys, tasks, futures = zip(*batch)
+
+        try:
+            values = await loop.run_in_executor(self.pool, run_chunk, self.engine, list(tasks))
+        except Exception as error:
+            if len(batch) > 1:
+                await asyncio.gather(*[self.run_batch([item]) for item in batch])
+            else:
+                if keys[0] is not None:
+                    self.running.pop(keys[0])
+                futures[0].set_exception(error)
+            return
+
+        for key, future, value in zip(keys, futures, values):
+            value = float(value)
+            if key is not None:
+                self.running.pop(key)
+                self.cache[key] = value
+            future.set_result(value)
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def handle(self, reader, writer):
+        """
+        Answer one HTTP request
+        """
+
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            status, response = await self.respond(*request_line[:2], body)
+        except Exception as error:
+            status, response = 400, {"error": str(error)}
+
+        content = json.dumps(response).encode("utf-8")
+        writer.write("HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n"
+                     "Connection: close\r\n\r\n".format(status, reasons[status], len(content)).encode("latin-1"))
+        writer.write(content)
+        await writer.drain()
+        writer.close()
+
+    async def respond(self, method, path, body):
+        """
+        Return the status and the JSON response of a request
+        """
+
+        if path == "/health":
+            return 200, {"status": "ok", "engine": self.engine, "cache": len(self.cache), "batches": self.batches}
+
+        if path != "/run":
+            return 404, {"error": "Unknown path '{}', use /run or /health".format(path)}
+        if method != "POST":
+            return 405, {"error": "Use POST to run scenarios"}
+
+        scenarios = json.loads(body)
+        if isinstance(scenarios, dict):
+            scenarios = [scenarios]
+        tasks = [task_from_dict(fields) for fields in scenarios]
+
+        results = await self.run(tasks)
+
+        return 200, {"results": [{"hash": key, "waiting_factor": value, "cached": cached}
+                                 for key, value, cached in results]}
+
+
+def main(argv=None):
+    """
+    Run the simulation service on localhost (python -m openqtsim.service)
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m openqtsim.service", description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-e", "--engine", default="heap", choices=["simpy", "heap", "batch"])
+    parser.add_argument("-w", "--workers", type=int, help="nr of threads or processes (nr of cores)")
+    parser.add_argument("-x", "--executor", default="process", choices=["thread", "process"])
+    parser.add_argument("--batch-delay", type=float, default=0.005, help="seconds to wait for other requests")
+    args = parser.parse_args(argv)
+
+    service = SimulationService(args.engine, args.workers, args.executor, args.batch_delay)
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
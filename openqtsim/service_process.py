@@ -1,3 +1,6 @@
+import numpy as np
+
+from openqtsim import distributions
 
 
 class ServiceProcess:
@@ -5,22 +8,47 @@ class ServiceProcess:
     Server process class for use in the OpenQTSim package
     """
 
-    def __init__(self, symbol='M', srv_rate=9):
+    def __init__(self, symbol='M', srv_rate=9, distribution=None, **params):
         """
-        symbol: symbol of the process (M, E_k, etc.)
-        srv_rate: services per hour
+        symbol: symbol of the process (M, E_k, D, G or any other symbol in distributions.DISTRIBUTIONS)
+        srv_rate: services per hour per server, or a list with the service rate of each server
+        distribution: explicit distribution of the service times (for G), a Distribution or scipy frozen object
+        params: parameters of the registered distribution, e.g. sigma for LN or data for Emp
         """
 
         self.symbol = symbol
         self.srv_rate = srv_rate
+        self.distribution = distribution
+        self.params = params
+
+    def get_rate(self, s_id=1):
+        """
+        Return the service rate of server s_id (servers are numbered from 1)
+        """
+
+        if np.ndim(self.srv_rate):
+            return self.srv_rate[s_id - 1]
+
+        return self.srv_rate
+
+    def get_distribution(self, s_id=1):
+        """
+        Return the distribution of the service times of server s_id (not for D), with mean 1 / srv_rate
+        """
+
+        if self.distribution is not None:
+            return distributions.as_distribution(self.distribution)
+
+        rate = self.get_rate(s_id)
+        mean = 1 / rate if rate is not None else None
+        return distributions.from_symbol(self.symbol, mean=mean, **self.params)
 
     def get_ST(self, server, customer_nr=[]):
         """
         Return the inter arrival time based on the inter arrival time distribution or deterministic list
         """
 
-        if self.symbol == "M" or self.symbol[0] == "E":
-            return server.service_distribution.rvs()
-
-        elif self.symbol == "D":
+        if self.symbol == "D":
             return server.service_distribution.loc[customer_nr, ['ST']].item()
+
+        return server.service_distribution.rvs()
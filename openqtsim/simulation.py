@@ -3,10 +3,12 @@ import pandas as pd
 import numpy as np
 import datetime
 import time
-from scipy import stats
 from collections import namedtuple
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from openqtsim import analytics, plotting
+from openqtsim.distributions import Sampler, spawn_streams
+from openqtsim.server_pool import ServerPool
+from openqtsim.system_state import SystemState
 
 
 class Simulation:
@@ -14,13 +16,21 @@ class Simulation:
     A discrete event simulation that simulates the queue.
     - queue is a queue based on the queue class
     - seed is a random seed to have retraceable simulations
+    - policy is the assignment policy of free servers to customers (see ServerPool)
+    - schedule is a CapacitySchedule with shifts and breakdowns of the servers (None: always available); the
+      breakdowns are drawn from the streams of the seed
+    - state_resolution and state_change_points reduce the system state trace (see SystemState)
     """
 
-    def __init__(self, queue, max_arr=100, priority=False, seed=None):
+    def __init__(self, queue, max_arr=100, priority=False, seed=None, policy="fifo", schedule=None,
+                 state_resolution=None, state_change_points=False):
         """
         Initialization (the basic time unit is hours)
         """
 
+        if schedule is not None:
+            schedule.check(queue.c)
+
         self.queue = queue
         self.max_arr = max_arr
 
@@ -32,10 +42,8 @@ class Simulation:
         # initialise counters and logs
         self.c_s = 0  # people in the system
         self.c_q = 0  # people in the queue
-        self.system_state = {
-            "t": [0],
-            "c_s": [0],
-            "c_q": [0]}
+        self.recorder = SystemState(resolution=state_resolution, change_points=state_change_points)
+        self.system_state = self.recorder.state
 
         self.customer_nr = 0
         self.log = {
@@ -50,65 +58,59 @@ class Simulation:
             "ITS": [],  # ITS = idle time of the server
             "s_id": []}  # s_id = server id
 
-        # activate random seed
-        np.random.seed(seed)
+        # random streams owned by this simulation: one for the arrivals, one per server and one for the
+        # assignment policy, so simulations in the same process (or thread) do not share random state
+        self.streams = spawn_streams(seed, self.queue.c)
 
         # define arrival and service processes
         if not priority:
 
             # --- arrival distribution ---
-            if self.queue.A.symbol == "M":
-                # define the average inter arrival time and add distribution with appropriate scaling
-                aver_IAT = 1 / self.queue.A.arr_rate
-                self.queue.A.arrival_distribution = stats.expon(scale=aver_IAT)
-
-            elif self.queue.A.symbol[0] == "E":
-                # define the average inter arrival time and add distribution with appropriate scaling
-                aver_IAT = 1 / self.queue.A.arr_rate
-                k = int(self.queue.A.symbol[1:])
-                loc = 0
-                self.queue.A.arrival_distribution = stats.erlang(k, loc=loc, scale=aver_IAT / k)
-
-            elif self.queue.A.symbol == "D":
+            # kept on the simulation (like the servers) and not on the queue, so that simulations that share a
+            # queue do not share the arrival stream
+            if self.queue.A.symbol == "D":
                 # the deterministic type expects arr_rate to contain a dataframe with columns ["name","IAT","AT"]
-                self.queue.A.arrival_distribution = self.queue.A.arr_rate
+                self.arrival_distribution = self.queue.A.arr_rate
+
+            else:
+                # any other symbol is looked up in the distribution registry, values are drawn in blocks
+                self.arrival_distribution = Sampler(self.queue.A.get_distribution(), self.streams["arrival"])
 
             # --- service distribution ---
-            self.env.servers = simpy.FilterStore(self.env, capacity=self.queue.c)
-            self.env.servers.items = []  # to be filled in the next steps depending on S.symbol
+            servers = []  # to be filled in the next steps depending on S.symbol
             self.env.server_info = {}  # to be filled in the next steps depending on S.symbol
-            Server = namedtuple('Server', 'service_distribution, last_active, id')
-
-            if self.queue.S.symbol == "M":
-                # define the average service time and add distribution with appropriate scaling for each server
-                aver_ST = 1 / self.queue.S.srv_rate
-                for i in range(1, self.queue.c + 1):
-                    self.env.servers.items.append(Server(stats.expon(scale=aver_ST), self.env.now, i))
-                    self.env.server_info.update({i: {'last_active': self.env.now}})
+            Server = namedtuple('Server', 'service_distribution, last_active, id, srv_rate')
 
-            elif self.queue.S.symbol[0] == "E":
-                # define the average service time and add distribution with appropriate scaling for each server
-                aver_ST = 1 / self.queue.S.srv_rate
-                for i in range(1, self.queue.c + 1):
-                    k = int(self.queue.S.symbol[1:])
-                    loc = 0
-                    self.env.servers.items.append(Server(stats.erlang(k, loc=loc,  scale=aver_ST/k), self.env.now, i))
-                    self.env.server_info.update({i: {'last_active': self.env.now}})
-
-            elif self.queue.S.symbol == "D":
+            if self.queue.S.symbol == "D":
                 if self.queue.c == 1:
                     # for 1 server the deterministic type expects srv_rate to contain a dataframe
                     # with columns: ["name","ST"]
-                    self.env.servers.items.append(Server(self.queue.S.srv_rate, self.env.now, 1))
+                    df = self.queue.S.srv_rate
+                    servers.append(Server(df, self.env.now, 1, 1 / df["ST"].mean()))
                     self.env.server_info.update({1: {'last_active': self.env.now}})
                 else:
                     # for n servers the deterministic type expects srv_rate to contain a dataframe
                     # with columns: ["name","ST","s_id"]
                     for i in range(1, self.queue.c + 1):
-                        self.env.servers.items.append(Server(self.queue.S.srv_rate[self.queue.S.srv_rate["s_id"] == i],
-                                                             self.env.now, i))
+                        df = self.queue.S.srv_rate[self.queue.S.srv_rate["s_id"] == i]
+                        servers.append(Server(df, self.env.now, i, 1 / df["ST"].mean()))
                         self.env.server_info.update({i: {'last_active': self.env.now}})
 
+            else:
+                # any other symbol is looked up in the distribution registry, each server draws its own values
+                # (srv_rate may be a list with a service rate per server)
+                for i in range(1, self.queue.c + 1):
+                    distribution = self.queue.S.get_distribution(i)
+                    sampler = Sampler(distribution, self.streams["servers"][i])
+                    servers.append(Server(sampler, self.env.now, i, 1 / distribution.mean))
+                    self.env.server_info.update({i: {'last_active': self.env.now}})
+
+            # the server pool hands out free servers according to the assignment policy; the breakdowns of this run
+            # are drawn from its own streams, so the schedule itself is not changed by the run
+            self.availability = schedule.start(self.streams["breakdowns"]) if schedule is not None else None
+            self.env.servers = ServerPool(self.env, servers, policy=policy, rng=self.streams["policy"],
+                                          availability=self.availability)
+
         else:
             pass
             # Todo: add the option of having priority arrivals?
@@ -159,9 +161,7 @@ class Simulation:
         # c_q = number of customers in the queue
         """
 
-        self.system_state["t"].append(t)
-        self.system_state["c_s"].append(c_s)
-        self.system_state["c_q"].append(c_q)
+        self.recorder.record(t, c_s, c_q)
 
     def return_log(self):
         """
@@ -172,9 +172,8 @@ class Simulation:
         df_cust = pd.DataFrame.from_dict(self.log)
         df_cust = df_cust.sort_values(by=['AT'], ascending=[True])
 
-        # convert self.system_state to dataframe
-        df_sys = pd.DataFrame.from_dict(self.system_state)
-        df_sys = df_sys.sort_values(by=['t'], ascending=[True])
+        # convert self.system_state to dataframe (the recorder keeps it in order of time)
+        df_sys = self.recorder.to_frame()
 
         return df_cust, df_sys
 
@@ -191,7 +190,8 @@ class Simulation:
 
         value = (df_cust["TSE"].iloc[-1] - np.sum(df_cust["ITS"])) / df_cust["TSE"].iloc[-1]
         print('Rho_system: system utilisation: {:.4f}'.format(value))
-        value = (np.sum(df_cust["TCWQ"])/self.queue.c) / df_cust["TSE"].iloc[-1]
+        # servers that were never used do not appear in server_stats, hence the division by c
+        value = analytics.server_stats(df_cust)["utilisation"].sum() / self.queue.c
         print('Rho_server: server utilisation: {:.4f}'.format(value))
 
         value = np.sum(df_cust["ITS"]) / df_cust["TSE"].iloc[-1]
@@ -216,70 +216,18 @@ class Simulation:
         print('ST: average service time: {:.4f}'.format(value))
         print('')
 
-    def plot_system_state(self, fontsize=20):
+    def plot_system_state(self, fontsize=20, n_buckets=2000):
         """
-        Plot number of customers in the system and in the queue as a function of time
+        Plot number of customers in the system and in the queue as a function of time (see plotting)
         """
 
-        df_cust, df_sys = self.return_log()
-
-        sns.set(style="white", palette="muted", color_codes=True)
+        return plotting.plot_system_state(self.recorder.to_frame(), n_buckets=n_buckets, fontsize=fontsize)
 
-        # Set up the matplotlib figure
-        fig, ax = plt.subplots(figsize=(14, 7), sharex=True)
-        sns.despine(left=True)
-
-        # Plot a simple histogram with binsize determined automatically
-        a = sns.lineplot(x=df_sys['t'], y=df_sys['c_s'], color="b", label="Nr. cust. in system")
-        b = sns.lineplot(x=df_sys['t'], y=df_sys['c_q'], color="r", label="Nr. cust. in queue")
-
-        # set labels
-        a.set_xlabel("Time (hours)", fontsize=fontsize)
-        a.set_ylabel("Nr. of customers", fontsize=fontsize)
-        a.tick_params(labelsize=fontsize)
-
-        # fig.suptitle(self.queue.kendall_notation, fontsize=fontsize)
-
-        return fig, ax
-
-    def plot_IAT_ST(self, fontsize=20):
+    def plot_IAT_ST(self, fontsize=20, bins=50):
         """
-        Plot histograms of IAT's and ST's
+        Plot histograms of IAT's and ST's (see plotting)
         """
 
-
         df_cust, df_sys = self.return_log()
 
-        sns.set(style="white", palette="muted", color_codes=True)
-
-        # Set up the matplotlib figure
-        fig, axes = plt.subplots(1, 2, figsize=(14, 7), sharex=True)
-        sns.despine(left=True)
-
-        # Plot a simple histogram with binsize determined automatically
-        a = sns.histplot(df_cust['IAT'], kde=False, color="b", ax=axes[0])
-        IAT_av = np.mean(df_cust["IAT"])
-        # axes[0].plot([IAT_av, IAT_av], [0, axes[0].axis()[-1]], linewidth=3, color='k')
-        axes[0].plot([IAT_av, IAT_av], [0, 1000], linewidth=3, color='k')
-
-        b = sns.histplot(df_cust['ST'], kde=False, color="b", ax=axes[1])
-        ST_av = np.mean(df_cust["ST"])
-        # axes[1].plot([ST_av, ST_av], [0, axes[1].axis()[-1]], linewidth=3, color='k')
-        axes[1].plot([ST_av, ST_av], [0, 1000], linewidth=3, color='k')
-
-        # plt.setp(axes, yticks=[])
-        plt.tight_layout()
-
-        # set labels
-        a.set_xlabel("Inter arrival times", fontsize=fontsize)
-        a.set_ylabel("Nr. of customers", fontsize=fontsize)
-        a.tick_params(labelsize=fontsize)
-
-        b.set_xlabel("Service times", fontsize=fontsize)
-        b.set_ylabel("Nr. of customers", fontsize=fontsize)
-        b.tick_params(labelsize=fontsize)
-
-        # fig.suptitle(self.queue.kendall_notation, fontsize=fontsize)
-
-        return fig, axes
-
+        return plotting.plot_IAT_ST(df_cust, bins=bins, fontsize=fontsize)
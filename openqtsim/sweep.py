@@ -0,0 +1,150 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
+import sqlite3
+
+import numpy as np
+
+import openqtsim
+from openqtsim.mt_engine import Task, worker
+
+
+def task_grid(A=("M",), S=("M",), c=(1,), nr_arr=(1000,), lam=(8,), mu=(9,), seed=(None,)):
+    """
+    Return the list of Tasks that spans the cartesian product of the given parameter values
+    """
+
+    return [Task(*values) for values in itertools.product(A, S, c, nr_arr, lam, mu, seed)]
+
+
+def scenario_hash(task, engine_version=None, engine=None):
+    """
+    Return a stable hash of a Task. The engine version and the engine (e.g. the name of the worker function) are part
+    of the hash, so results of an older version of OpenQTSim or of another engine are never returned
+    """
+
+    if engine_version is None:
+        engine_version = openqtsim.__version__
+
+    # numpy scalars are converted to python scalars so that 8 and np.int64(8) give the same hash
+    fields = {key: (value.item() if isinstance(value, np.generic) else value) for key, value in task._asdict().items()}
+    fields["engine_version"] = engine_version
+    fields["engine"] = engine
+
+    key = json.dumps(fields, sort_keys=True, default=str)
+
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def engine_name(func):
+    """
+    Return the name under which the results of a worker function are cached, e.g. "openqtsim.mt_engine.worker"
+    """
+
+    return "{}.{}".format(func.__module__, func.__qualname__)
+
+
+class ResultCache:
+    """
+    On-disk cache (SQLite) of scenario results keyed by the scenario hash
+    """
+
+    def __init__(self, path="openqtsim_cache.sqlite"):
+        """
+        path: location of the SQLite database (":memory:" gives a cache that lives as long as the object)
+        """
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (hash TEXT PRIMARY KEY, task TEXT, engine_version TEXT, value REAL)")
+        self.connection.commit()
+
+    def get_many(self, hashes):
+        """
+        Return a dictionary {hash: value} with the cached results among the given hashes
+        """
+
+        found = {}
+        hashes = list(hashes)
+
+        # query in chunks to stay below the maximum number of SQLite host parameters
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            query = "SELECT hash, value FROM results WHERE hash IN ({})".format(",".join("?" * len(chunk)))
+            found.update(self.connection.execute(query, chunk).fetchall())
+
+        return found
+
+    def put_many(self, records):
+        """
+        Store an iterable of (hash, task, value) records
+        """
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            [(key, json.dumps(task._asdict(), default=str), openqtsim.__version__, float(value))
+             for key, task, value in records])
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+
+def sweep(tasks, cache="openqtsim_cache.sqlite", processes=None, func=worker, chunksize=1, engine=None,
+          commit_every=100):
+    """
+    Return the results of func (default: mt_engine.worker) for a list of Tasks in the same order.
+    - cache: a ResultCache, a path to the SQLite cache or None (no caching)
+    - processes: number of worker processes (None: all cores, 1: run in this process)
+    - engine: name under which the results are cached (None: module and name of func, see engine_name)
+    - commit_every: nr of results that are written to the cache at once
+    Only the tasks that are not in the cache are calculated (in parallel). Results are written to the cache while
+    the sweep runs, so an interrupted sweep keeps what it has done. Tasks without a seed give a different value every
+    run, so they are neither taken from nor added to the cache.
+    """
+
+    tasks = list(tasks)
+    if cache is not None and not isinstance(cache, ResultCache):
+        cache = ResultCache(cache)
+
+    engine = engine or engine_name(func)
+
+    # tasks without a seed get a key of their own, which is never looked up in the cache
+    keys = [scenario_hash(task, engine=engine) if task.seed is not None else i for i, task in enumerate(tasks)]
+    seeded = [key for key in keys if isinstance(key, str)]
+    found = cache.get_many(set(seeded)) if cache is not None and seeded else {}
+
+    # identical scenarios within the sweep only need to be calculated once
+    missing = {}
+    for key, task in zip(keys, tasks):
+        if key not in found and key not in missing:
+            missing[key] = task
+
+    if missing:
+        todo = list(missing.values())
+        pool = multiprocessing.Pool(processes) if processes != 1 else None
+
+        try:
+            values = map(func, todo) if pool is None else pool.imap(func, todo, chunksize=chunksize)
+
+            records = []
+            for (key, task), value in zip(missing.items(), values):
+                found[key] = value
+                if cache is not None and isinstance(key, str):
+                    records.append((key, task, value))
+                if len(records) >= commit_every:
+                    cache.put_many(records)
+                    records = []
+
+            if records:
+                cache.put_many(records)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    return [found[key] for key in keys]
@@ -0,0 +1,58 @@
+import math
+
+import pandas as pd
+
+
+class SystemState:
+    """
+    Recorder of the nr of customers in the system (c_s) and in the queue (c_q) over time. Records must come in
+    order of time; records at the same time are coalesced into one with the last state, so the trace is a
+    monotone step function.
+    - resolution: None keeps every event time; a time step dt keeps only the last state within each step, stamped at
+      the end of the step, so that the trace is the state sampled on a regular grid
+    - change_points: if True, records that do not change the state are dropped
+    """
+
+    def __init__(self, resolution=None, change_points=False):
+        self.resolution = resolution
+        self.change_points = change_points
+
+        self.state = {
+            "t": [0],
+            "c_s": [0],
+            "c_q": [0]}
+
+    def __len__(self):
+        return len(self.state["t"])
+
+    def record(self, t, c_s, c_q):
+        """
+        Add the state at time t
+        """
+
+        times, systems, queues = self.state["t"], self.state["c_s"], self.state["c_q"]
+
+        if self.resolution:
+            t = math.ceil(t / self.resolution) * self.resolution
+
+        if t < times[-1]:
+            raise ValueError("The system state at t = {} is recorded after t = {}".format(t, times[-1]))
+
+        if t == times[-1]:
+            # coalesce with the record at the same time; if that brings the state back to the one before, the
+            # record is no change point anymore
+            systems[-1], queues[-1] = c_s, c_q
+            if self.change_points and len(times) > 1 and (systems[-2], queues[-2]) == (c_s, c_q):
+                del times[-1], systems[-1], queues[-1]
+
+        elif not self.change_points or (systems[-1], queues[-1]) != (c_s, c_q):
+            times.append(t)
+            systems.append(c_s)
+            queues.append(c_q)
+
+    def to_frame(self):
+        """
+        Return the trace as a dataframe with columns t, c_s and c_q
+        """
+
+        return pd.DataFrame.from_dict(self.state)
@@ -52,6 +52,11 @@ setup(
         "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
     ],
+    entry_points={
+        "console_scripts": [
+            "openqtsim = openqtsim.cli:main",
+        ],
+    },
     description="OpenQTSim facilitates discrete event simulation of queues with a Kendall notation.",
     install_requires=requires,
     long_description=long_description,
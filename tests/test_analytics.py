@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import openqtsim
+
+"""
+"""
+
+
+def test_busy_periods_and_idle_gaps():
+    df_cust = pd.DataFrame({
+        "s_id": [1, 2, 1, 1, 2],
+        "TSB": [1.0, 2.0, 3.0, 5.0, 4.0],
+        "TSE": [3.0, 4.0, 5.0, 6.0, 7.0],
+        "ST": [2.0, 2.0, 2.0, 1.0, 3.0]})
+
+    periods = openqtsim.analytics.busy_periods(df_cust)
+    np.testing.assert_array_equal(periods["s_id"], [1, 2])
+    np.testing.assert_array_equal(periods["length"], [5.0, 5.0])
+    np.testing.assert_array_equal(periods["customers"], [3, 2])
+
+    gaps = openqtsim.analytics.idle_gaps(df_cust)
+    np.testing.assert_array_equal(gaps["length"], [1.0, 2.0])
+
+    stats = openqtsim.analytics.server_stats(df_cust, horizon=10)
+    np.testing.assert_almost_equal(stats.loc[1, "utilisation"], 0.5)
+    np.testing.assert_almost_equal(stats.loc[2, "idle_time"], 5.0)
+
+    counts, edges, servers = openqtsim.analytics.histogram(gaps, bins=2, by_server=True)
+    np.testing.assert_array_equal(counts, [[1, 0], [0, 1]])
+
+
+def test_server_stats_from_simulation():
+    queue = openqtsim.Queue(openqtsim.ArrivalProcess("M", 8), openqtsim.ServiceProcess("M", 3), c=4)
+    sim = openqtsim.Simulation(queue, seed=2)
+    sim.run(2000)
+    df_cust, df_sys = sim.return_log()
+
+    stats = openqtsim.analytics.server_stats(df_cust)
+
+    np.testing.assert_almost_equal(stats["busy_time"].sum(), df_cust["ST"].sum(), decimal=4)
+    assert stats["customers"].sum() == len(df_cust)
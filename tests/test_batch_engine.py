@@ -0,0 +1,40 @@
+import numpy as np
+import openqtsim
+
+"""
+"""
+
+
+def test_lindley_matches_mm1():
+    mm1 = openqtsim.MM1(lam=8, mu=9, nr_arr=500, seed=1)
+    IAT, ST = mm1.get_IAT_and_ST()
+    df_cust = mm1.calculate(IAT, ST)
+
+    W = openqtsim.lindley(IAT, ST)
+
+    np.testing.assert_allclose(W[0], df_cust["TCWQ"], atol=1e-9)
+
+
+def test_worker_batch():
+    lam = np.array([2, 4, 6, 2])
+    nr_arr = np.array([20000, 20000, 20000, 10])
+
+    factor = openqtsim.worker_batch(lam, 10, nr_arr, seed=1, max_bytes=2 ** 20)
+    assert factor.shape == (4,)
+
+    # M/M/1: W_q / (1 / mu) = rho / (1 - rho)
+    rho = lam[:3] / 10
+    np.testing.assert_allclose(factor[:3], rho / (1 - rho), rtol=0.2)
+
+    # with a seed per scenario the result does not depend on the rest of the batch
+    seeds = [11, 12, 13, 14]
+    factor = openqtsim.worker_batch(lam, 10, nr_arr, seed=seeds)
+    np.testing.assert_allclose(openqtsim.worker_batch(lam[3:], 10, nr_arr[3:], seed=seeds[3:]), factor[3:])
+
+
+def test_seeds_use_the_streams_of_the_other_engines():
+    # a seed per scenario draws from the same arrival and server streams as the SimPy and heap engines
+    tasks = [openqtsim.Task(A, S, 1, 2000, 4, 5, seed) for A, S, seed in [("M", "M", 1), ("E2", "E3", 2),
+                                                                          ("LN", "Gamma", 3)]]
+    np.testing.assert_allclose(openqtsim.batch_worker(tasks), [openqtsim.heap_worker(task) for task in tasks],
+                               rtol=1e-10)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+import openqtsim
+
+"""
+"""
+
+
+def test_shift_schedule():
+    availability = openqtsim.CapacitySchedule(3, times=[8, 16, 24], capacity=[1, 2, 3]).start()
+
+    assert availability.next_up(3, 5) == 5
+    assert availability.next_up(3, 10) == 24
+    assert availability.next_up(2, 10) == 16
+    assert availability.next_up(1, 10) == 10
+
+    availability = openqtsim.CapacitySchedule(2, times=[8], capacity=[1]).start()
+    assert availability.next_up(2, 9) == np.inf
+
+
+def test_breakdowns():
+    schedule = openqtsim.CapacitySchedule(1, mtbf=9, repair=1)
+    availability = schedule.start(1)
+
+    t = np.linspace(0, 10000, 20001)
+    down = np.mean([availability.next_up(1, t_i) > t_i for t_i in t])
+
+    np.testing.assert_allclose(down, 0.1, atol=0.02)
+
+    # the windows follow from the seed and do not depend on the order in which they are asked for
+    reverse = schedule.start(1)
+    assert [reverse.next_up(1, t_i) for t_i in t[::-1]] == [availability.next_up(1, t_i) for t_i in t[::-1]]
+
+
+def test_engines_respect_the_schedule():
+    A = openqtsim.ArrivalProcess("M", arr_rate=4)
+    S = openqtsim.ServiceProcess("M", srv_rate=2)
+    queue = openqtsim.Queue(A, S, c=3)
+
+    times = np.arange(1, 200) * 4.
+    capacity = np.tile([3, 1, 2], len(times))[:len(times)]
+    schedule = openqtsim.CapacitySchedule(3, times, capacity, mtbf=20, repair=2)
+
+    sim = openqtsim.Simulation(queue, seed=1, schedule=schedule)
+    sim.run(500)
+    df_simpy, df_sys = sim.return_log()
+
+    # each engine draws the breakdowns of its run from the streams of the seed, the schedule holds no windows
+    df_heap = openqtsim.heap_engine.simulate(queue, 500, seed=1, schedule=schedule)
+    availability = schedule.start(1)
+
+    for df in [df_simpy, df_heap]:
+        assert len(df) == 500
+        assert all(availability.next_up(s_id, t) - t < 1e-5 for s_id, t in zip(df["s_id"], df["TSB"]))
+
+    # the same seed gives the same run, another seed other breakdowns
+    np.testing.assert_array_equal(openqtsim.heap_engine.simulate(queue, 500, seed=1, schedule=schedule)["TSB"],
+                                  df_heap["TSB"])
+    np.testing.assert_array_equal(df_simpy.sort_values("c_id")["s_id"], df_heap["s_id"])
+    assert not np.array_equal(openqtsim.heap_engine.simulate(queue, 500, seed=2, schedule=schedule)["s_id"],
+                              df_heap["s_id"])
+
+
+def test_schedule_must_match_the_queue():
+    queue = openqtsim.Queue(openqtsim.ArrivalProcess("M", 4), openqtsim.ServiceProcess("M", 2), c=3)
+    schedule = openqtsim.CapacitySchedule(2, times=[8], capacity=[1], mtbf=20)
+
+    with pytest.raises(ValueError, match="2 servers, the queue has 3"):
+        openqtsim.Simulation(queue, seed=1, schedule=schedule)
+    with pytest.raises(ValueError, match="2 servers, the queue has 3"):
+        openqtsim.heap_engine.simulate(queue, 100, seed=1, schedule=schedule)
+
+
+def test_engines_agree_on_given_times():
+    rng = np.random.default_rng(2)
+    n = 300
+    IAT = rng.exponential(1 / 4, n)
+    ST = rng.exponential(1 / 5, n)
+    schedule = openqtsim.CapacitySchedule(1, times=[10, 12, 30, 35], capacity=[0, 1, 0, 1])
+
+    A = openqtsim.ArrivalProcess("D", pd.DataFrame({"IAT": IAT}))
+    S = openqtsim.ServiceProcess("D", pd.DataFrame({"ST": ST}, index=np.arange(1, n + 1)))
+    sim = openqtsim.Simulation(openqtsim.Queue(A, S, c=1), schedule=schedule)
+    sim.run(n)
+    df_simpy, df_sys = sim.return_log()
+
+    df_heap = openqtsim.heap_engine.simulate(openqtsim.Queue(c=1), n, IAT=IAT, ST=ST, schedule=schedule)
+
+    np.testing.assert_allclose(df_simpy["TSB"], df_heap["TSB"], atol=1e-6)
+    assert not np.any((df_heap["TSB"] >= 10) & (df_heap["TSB"] < 12))
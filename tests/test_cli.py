@@ -0,0 +1,41 @@
+import json
+
+import numpy as np
+import pandas as pd
+import openqtsim
+from openqtsim import cli
+
+"""
+"""
+
+
+def test_main(tmp_path):
+    scenarios = {
+        "engine": "heap",
+        "tasks": [{"A": "M", "S": "E2", "c": 1, "nr_arr": 500, "lam": 4, "mu": 5, "seed": 3}],
+        "grid": {"c": [1, 2], "nr_arr": 500, "lam": [4, 6], "mu": 8, "seed": 1}}
+    with open(tmp_path / "scenarios.json", "w") as f:
+        json.dump(scenarios, f)
+
+    assert cli.main([str(tmp_path / "scenarios.json"), "-o", str(tmp_path / "results.csv"), "-x", "thread",
+                     "--chunk", "2", "-q"]) == 0
+
+    df = pd.read_csv(tmp_path / "results.csv")
+    tasks, settings = cli.load_tasks(tmp_path / "scenarios.json")
+
+    assert len(df) == 5 and settings == {"engine": "heap"}
+    np.testing.assert_allclose(df["waiting_factor"], openqtsim.run_tasks(tasks, "heap", max_workers=1))
+
+    # the results can be fed back as a csv of Tasks
+    assert cli.load_tasks(tmp_path / "results.csv")[0] == tasks
+
+
+def test_main_batch_engine(tmp_path):
+    tasks = openqtsim.task_grid(nr_arr=[300], lam=[2, 4, 6, 7], mu=[8], seed=[1, 2])
+    cli.results_frame(tasks, np.zeros(len(tasks))).to_csv(tmp_path / "tasks.csv", index=False)
+
+    assert cli.main([str(tmp_path / "tasks.csv"), "-o", str(tmp_path / "results.csv"), "-e", "batch", "-w", "2",
+                     "--chunk", "3", "-q"]) == 0
+
+    df = pd.read_csv(tmp_path / "results.csv")
+    np.testing.assert_allclose(df["waiting_factor"], openqtsim.batch_worker(tasks))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from scipy.sparse.linalg import expm_multiply
+import openqtsim
+
+"""
+"""
+
+
+def test_stationary_mm1():
+    p = openqtsim.ctmc.stationary(8, 10, 1)[0]
+    n = np.arange(len(p))
+
+    np.testing.assert_allclose(p[:50], 0.2 * 0.8 ** n[:50], atol=1e-12)
+
+
+def test_measures_against_lookup_table():
+    # the Groenveld (2007) table gives the waiting factor of M/M/n queues
+    queue = openqtsim.Queue()
+    rho = np.array([0.3, 0.5, 0.7, 0.9])
+
+    df = openqtsim.ctmc.measures(rho * 2, 1, 2)
+
+    np.testing.assert_allclose(df["waiting_factor"], [0.0989, 0.3333, 0.9608, 4.2632], atol=1e-4)
+    np.testing.assert_allclose(df["Rho_server"], rho)
+    np.testing.assert_allclose(queue.occupancy_to_waitingfactor(0.5, 2), df["waiting_factor"][1], atol=5e-3)
+
+
+def test_transient_against_matrix_exponential():
+    queue = openqtsim.Queue(openqtsim.ArrivalProcess("M", 3), openqtsim.ServiceProcess("M", 1), c=2, K=6)
+    lam, mu, c, K = openqtsim.ctmc.parameters(queue)
+
+    t = [0, 0.5, 2, 50]
+    p = openqtsim.ctmc.transient(lam, mu, c, K, t)[0]
+
+    Q = openqtsim.ctmc.generator(lam, mu, c, K)
+    p0 = np.zeros(K + 1)
+    p0[0] = 1
+    for i, t_i in enumerate(t):
+        np.testing.assert_allclose(p[i], expm_multiply(Q.T * t_i, p0), atol=1e-8)
+
+    np.testing.assert_allclose(p[-1], openqtsim.ctmc.stationary(lam, mu, c, K)[0], atol=1e-8)
+
+
+def test_parameter_sets_with_different_capacities():
+    # a finite K below the common truncation leaves the states above K empty
+    lam, mu, c, K = [4, 4, 6], [5, 5, 4], [1, 1, 2], [3, np.inf, 10]
+    p = openqtsim.ctmc.stationary(lam, mu, c, K)
+    df = openqtsim.ctmc.measures(lam, mu, c, K)
+
+    for i in range(3):
+        alone = openqtsim.ctmc.stationary(lam[i], mu[i], c[i], K[i])[0]
+        np.testing.assert_allclose(p[i, :len(alone)], alone, atol=1e-14)
+        np.testing.assert_allclose(p[i, len(alone):], 0)
+        expected = openqtsim.ctmc.measures(lam[i], mu[i], c[i], K[i]).iloc[0]
+        np.testing.assert_allclose(df.iloc[i], expected, rtol=1e-10)
+
+    # M/M/1/3: p[n] proportional to (4 / 5) ** n
+    np.testing.assert_allclose(df["P_block"][0], 0.8 ** 3 / np.sum(0.8 ** np.arange(4)))
+
+    with pytest.raises(ValueError):
+        openqtsim.ctmc.generator(lam, mu, c, K)
@@ -0,0 +1,66 @@
+import numpy as np
+from scipy import stats
+import openqtsim
+from openqtsim import distributions
+
+"""
+"""
+
+
+def test_registry_means():
+    rng = np.random.default_rng(1)
+    data = rng.lognormal(0, 1, 1000)
+
+    cases = [
+        distributions.from_symbol("M", mean=2),
+        distributions.from_symbol("E3", mean=2),
+        distributions.from_symbol("Gamma", mean=2, shape=0.7),
+        distributions.from_symbol("LN", mean=2, sigma=0.8),
+        distributions.from_symbol("H2", mean=2, cv=2),
+        distributions.from_symbol("PH", mean=2, alpha=[0.5, 0.5], T=[[-2, 1], [0, -3]]),
+        distributions.from_symbol("Emp", mean=2, data=data),
+        distributions.as_distribution(stats.weibull_min(1.5, scale=2 / 0.9027))]
+
+    for distribution in cases:
+        x = distribution.sample((200, 500), rng)
+        assert x.shape == (200, 500)
+        assert np.all(x >= 0)
+        np.testing.assert_allclose(x.mean(), distribution.mean, rtol=0.02)
+        np.testing.assert_allclose(distribution.mean, 2, rtol=0.01)
+
+    # coefficient of variation of the balanced two phase hyperexponential
+    x = cases[4].sample(10 ** 6, rng)
+    np.testing.assert_allclose(x.std() / x.mean(), 2, rtol=0.05)
+
+
+def test_sampler_hands_out_blocks_in_order():
+    sampler = distributions.Sampler(distributions.Exponential(1), rng=np.random.default_rng(3), block=4)
+    values = [sampler.rvs() for _ in range(6)]
+
+    expected = distributions.Exponential(1).sample(4, np.random.default_rng(3))
+    np.testing.assert_array_equal(values[:4], expected)
+
+    # arrays are drawn in the same blocks, also for distributions whose values depend on the size of a draw
+    for distribution in [distributions.from_symbol("H2", mean=1, cv=2),
+                         distributions.from_symbol("PH", mean=1, alpha=[0.5, 0.5], T=[[-2, 1], [0, -3]]),
+                         distributions.from_symbol("Emp", data=[1., 2., 4.], bandwidth=0.3)]:
+        sampler = distributions.Sampler(distribution, rng=np.random.default_rng(3), block=4)
+        values = [sampler.rvs() for _ in range(15)]
+
+        sampler = distributions.Sampler(distribution, rng=np.random.default_rng(3), block=4)
+        arrays = [sampler.rvs(), sampler.rvs(2), sampler.rvs(0), sampler.rvs(9), sampler.rvs(3)]
+        np.testing.assert_array_equal(values, np.concatenate([np.ravel(x) for x in arrays]))
+
+
+def test_simulation_with_registered_distributions():
+    A = openqtsim.ArrivalProcess("H2", arr_rate=4, cv=1.5)
+    S = openqtsim.ServiceProcess("LN", srv_rate=3, sigma=0.5)
+    sim = openqtsim.Simulation(openqtsim.Queue(A, S, c=2), seed=1)
+    sim.run(2000)
+    df_cust, df_sys = sim.return_log()
+
+    np.testing.assert_allclose(df_cust["ST"].mean(), 1 / 3, rtol=0.1)
+    np.testing.assert_allclose(df_cust["IAT"].mean(), 1 / 4, rtol=0.1)
+
+    factor = openqtsim.worker_batch([4], [8], [1000], A=A.get_distribution(), S=S.get_distribution(), seed=1)
+    assert np.isfinite(factor).all()
@@ -0,0 +1,27 @@
+import numpy as np
+import openqtsim
+
+"""
+"""
+
+
+def test_resample_state():
+    t = [0, 2, 1, 2, 5]
+    c_s = [0, 2, 1, 3, 0]
+
+    values = openqtsim.resample_state(t, c_s, [-1, 0, 0.5, 1, 2, 4.9, 5, 10])
+
+    np.testing.assert_array_equal(values, [0, 0, 0, 1, 3, 3, 0, 0])
+
+
+def test_ensemble():
+    task = openqtsim.Task("M", "M", 1, 200, 4, 5, 1)
+    grid = np.linspace(0, 10, 11)
+
+    df = openqtsim.ensemble(task, 20, grid, processes=1, thresholds=[0, 2])
+
+    assert len(df) == len(grid)
+    assert df["c_s_mean"].iloc[0] == 0
+    assert np.all(df["c_s_q5"] <= df["c_s_q95"])
+    assert np.all(df["P(c_s>2)"] <= df["P(c_s>0)"])
+    np.testing.assert_array_equal(df["c_s_mean"], openqtsim.ensemble(task, 20, grid, processes=2)["c_s_mean"])
@@ -0,0 +1,161 @@
+import math
+
+import numpy as np
+import pandas as pd
+import openqtsim
+
+"""
+Equivalence of the engines (SimPy Simulation, heap_engine, MM1.calculate and the Lindley recursion of the batch
+engine) on randomly generated scenarios with common seeds, and agreement of the simulations with Erlang-C and the
+Groenveld (2007) tables. The scenarios are drawn from a fixed seed, so the tests are reproducible.
+"""
+
+
+# parameters of the distributions in the scenarios; hyperexponential, phase-type and smoothed empirical values depend
+# on the size of a draw, so they check that the engines draw in the same blocks
+params = {"M": {}, "E2": {}, "E3": {}, "Gamma": {"shape": 0.7}, "H2": {"cv": 1.5}, "LN": {"sigma": 0.8},
+          "PH": {"alpha": [0.5, 0.5], "T": [[-2, 1], [0, -3]]},
+          "Emp": {"data": np.random.default_rng(0).gamma(2, 0.5, 200), "bandwidth": "scott"}}
+
+
+def scenarios(n, seed=2024):
+    """
+    Yield n random (A, S, c, lam, mu) combinations with a server utilisation between 0.3 and 0.85 (mu per server)
+    """
+
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        A = rng.choice(["M", "E2", "E3", "H2", "LN", "PH", "Emp"])
+        S = rng.choice(["M", "E2", "Gamma", "H2", "LN", "PH", "Emp"])
+        c = int(rng.integers(1, 4))
+        lam = rng.uniform(1, 10)
+        yield A, S, c, lam, lam / (c * rng.uniform(0.3, 0.85))
+
+
+def processes(A, S, lam, mu):
+    """
+    Return the arrival and service process of a scenario
+    """
+
+    return openqtsim.ArrivalProcess(A, lam, **params[A]), openqtsim.ServiceProcess(S, mu, **params[S])
+
+
+def erlang_c(lam, mu, c):
+    """
+    Mean waiting time in the queue of M/M/c from the Erlang-C formula (mu per server)
+    """
+
+    a = lam / mu
+    rho = a / c
+    terms = sum(a ** k / math.factorial(k) for k in range(c))
+    p_wait = a ** c / math.factorial(c) / (1 - rho) / (terms + a ** c / math.factorial(c) / (1 - rho))
+
+    return p_wait / (c * mu - lam)
+
+
+def replications(queue, nr_arr, seeds, warm_up=1000):
+    """
+    Return the mean and the standard error over replications of the waiting factor (W_q / mean ST) of the heap engine
+    """
+
+    factors = []
+    for seed in seeds:
+        df = openqtsim.heap_engine.simulate(queue, nr_arr, seed=seed).iloc[warm_up:]
+        factors.append(df["TCWQ"].mean() / queue.S.get_distribution().mean)
+
+    return np.mean(factors), np.std(factors, ddof=1) / np.sqrt(len(factors))
+
+
+def test_simpy_and_heap_logs():
+    # with the same seed both engines draw the same values from the same streams and assign the same servers
+    for i, (A, S, c, lam, mu) in enumerate(scenarios(8)):
+        queue = openqtsim.Queue(*processes(A, S, lam, mu), c)
+
+        sim = openqtsim.Simulation(queue, seed=i)
+        sim.run(300)
+        df_simpy = sim.return_log()[0].sort_values("c_id")
+        df_heap = openqtsim.heap_engine.simulate(queue, 300, seed=i)
+
+        np.testing.assert_array_equal(df_simpy["s_id"], df_heap["s_id"])
+        np.testing.assert_allclose(df_simpy["ST"], df_heap["ST"], rtol=1e-12)
+        # the SimPy clock runs from an epoch of about 1.7e9, which limits its resolution to about 1e-7
+        for column in ["AT", "TSB", "TSE", "TCWQ"]:
+            np.testing.assert_allclose(df_simpy[column], df_heap[column], atol=1e-5)
+
+
+def test_single_server_logs():
+    # for given IAT's and ST's, the single server engines give the same customer log; the values are drawn from the
+    # processes of the scenario, with its load on one server
+    for i, (A, S, c, lam, mu) in enumerate(scenarios(4)):
+        queue = openqtsim.Queue(*processes(A, S, lam, mu * c), 1)
+        rng = np.random.default_rng(i)
+        IAT = queue.A.get_distribution().sample(200, rng)
+        ST = queue.S.get_distribution().sample(200, rng)
+
+        df_mm1 = openqtsim.MM1(lam, mu * c, 200).calculate(IAT, ST)
+        df_heap = openqtsim.heap_engine.simulate(queue, 200, IAT=IAT, ST=ST)
+        W = openqtsim.lindley(IAT, ST)[0]
+
+        # SimPy in deterministic mode with the same values
+        A_D = openqtsim.ArrivalProcess("D", pd.DataFrame({"IAT": IAT}))
+        S_D = openqtsim.ServiceProcess("D", pd.DataFrame({"ST": ST}, index=np.arange(1, 201)))
+        sim = openqtsim.Simulation(openqtsim.Queue(A_D, S_D, 1))
+        sim.run(200)
+        df_simpy = sim.return_log()[0].sort_values("c_id")
+
+        for column in ["AT", "TSB", "TSE", "TCWQ", "TCSS", "ITS"]:
+            np.testing.assert_allclose(df_heap[column], df_mm1[column], rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(W, df_mm1["TCWQ"], atol=1e-12)
+        np.testing.assert_allclose(df_simpy["TCWQ"], df_mm1["TCWQ"], atol=1e-5)
+
+
+def test_erlang_c():
+    for A, S, c, lam, mu in scenarios(6):
+        np.testing.assert_allclose(openqtsim.ctmc.measures(lam, mu, c)["W_q"], erlang_c(lam, mu, c), rtol=1e-8)
+
+    # M/M/c simulations agree with Erlang-C within 4 standard errors of 6 replications
+    for lam, mu, c in [(4, 5, 1), (6, 4, 2), (10, 4, 3)]:
+        queue = openqtsim.Queue(openqtsim.ArrivalProcess("M", lam), openqtsim.ServiceProcess("M", mu), c)
+        mean, std_err = replications(queue, 10000, range(6))
+        assert abs(mean - erlang_c(lam, mu, c) * mu) < 4 * std_err
+
+
+def test_single_server_engines_agree_with_erlang_c():
+    lam, mu = 4, 8
+    factor = erlang_c(lam, mu, 1) * mu
+
+    # the batched Lindley engine on its own draws, one seed per replication
+    factors = openqtsim.worker_batch(np.full(8, lam), mu, 20000, seed=list(range(8)))
+    assert abs(np.mean(factors) - factor) < 4 * np.std(factors, ddof=1) / np.sqrt(len(factors))
+
+    tasks = [openqtsim.Task("M", "M", 1, 5000, lam, mu, seed) for seed in range(8)]
+    for engine in ["batch", "simpy", "heap"]:
+        factors = openqtsim.run_tasks(tasks, engine, max_workers=2, executor="thread")
+        assert abs(np.mean(factors) - factor) < 4 * np.std(factors, ddof=1) / np.sqrt(len(factors))
+
+    # with the same seed the SimPy, heap and batch workers simulate the same customers
+    np.testing.assert_allclose([openqtsim.worker(task) for task in tasks[:3]],
+                               [openqtsim.heap_worker(task) for task in tasks[:3]], rtol=1e-6)
+    np.testing.assert_allclose(openqtsim.batch_worker(tasks), [openqtsim.heap_worker(task) for task in tasks],
+                               rtol=1e-10)
+
+    # also for the processes of the scenarios, with their load on one server
+    for i, (A, S, c, lam, mu) in enumerate(scenarios(8)):
+        A, S = processes(A, S, lam, mu * c)
+        queue = openqtsim.Queue(A, S, 1)
+        df = openqtsim.heap_engine.simulate(queue, 2000, seed=i)
+        factor = openqtsim.worker_batch(lam, mu * c, 2000, A.get_distribution(), S.get_distribution(), seed=[i])
+        np.testing.assert_allclose(factor[0], df["TCWQ"].mean() / df["ST"].mean(), rtol=1e-10)
+
+
+def test_groenveld():
+    # waiting factors of Groenveld (2007) Table I (M/M/n) and Table V (E2/E2/n) at utilisation 0.5 and 0.7
+    table = {("M", 1, .5): 1.0000, ("M", 2, .7): 0.9608, ("M", 3, .5): 0.1579,
+             ("E2", 1, .5): 0.3904, ("E2", 2, .7): 0.4125, ("E2", 3, .5): 0.0512}
+
+    for (symbol, c, rho), factor in table.items():
+        A = openqtsim.ArrivalProcess(symbol, 4)
+        S = openqtsim.ServiceProcess(symbol, 4 / (c * rho))
+        queue = openqtsim.Queue(A, S, c)
+        mean, std_err = replications(queue, 10000, range(6))
+        assert abs(mean - factor) < 4 * std_err
@@ -0,0 +1,45 @@
+import numpy as np
+import openqtsim
+from openqtsim import fitting
+
+"""
+"""
+
+
+def test_fit_ranks_the_generating_distribution_first():
+    rng = np.random.default_rng(1)
+
+    cases = [("M", rng.exponential(0.5, 50000)),
+             ("E3", rng.gamma(3, 0.5 / 3, 50000)),
+             ("LN", rng.lognormal(0, 0.4, 50000))]
+
+    for symbol, data in cases:
+        df = fitting.fit(data)
+        assert df["symbol"].iloc[0] == symbol
+        np.testing.assert_allclose(df["distribution"].iloc[0].mean, data.mean(), rtol=0.02)
+
+
+def test_fit_streams_chunks():
+    rng = np.random.default_rng(2)
+    data = rng.gamma(2.5, 1, 100000)
+
+    df_array = fitting.fit(data)
+    df_chunks = fitting.fit(iter(np.array_split(data, 7)))
+
+    np.testing.assert_allclose(df_array["aic"], df_chunks["aic"])
+    assert df_array["symbol"].iloc[0] == "Gamma"
+    np.testing.assert_allclose(df_array["params"].iloc[0]["shape"], 2.5, rtol=0.03)
+
+
+def test_fit_processes():
+    rng = np.random.default_rng(3)
+
+    A = fitting.fit_arrival_process(rng.exponential(1 / 4, 20000))
+    S = fitting.fit_service_process(rng.gamma(2, 1 / 6, 20000))
+
+    assert A.symbol == "M"
+    assert S.symbol == "E2"
+    np.testing.assert_allclose(A.arr_rate, 4, rtol=0.03)
+
+    sim = openqtsim.Simulation(openqtsim.Queue(A, S, c=1), seed=1)
+    sim.run(100)
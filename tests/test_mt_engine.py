@@ -0,0 +1,43 @@
+import numpy as np
+import openqtsim
+
+"""
+"""
+
+
+def test_run_tasks_threads_match_processes():
+    tasks = openqtsim.task_grid(A=["M", "E2"], c=[1, 2], nr_arr=[300], lam=[6], mu=[9], seed=[1, 2])
+
+    threads = openqtsim.run_tasks(tasks, "simpy", max_workers=4, executor="thread")
+    processes = openqtsim.run_tasks(tasks, "simpy", max_workers=2, executor="process")
+    serial = [openqtsim.worker(task) for task in tasks]
+
+    np.testing.assert_array_equal(threads, serial)
+    np.testing.assert_array_equal(processes, serial)
+
+    # the heap engine draws from the same random streams
+    np.testing.assert_allclose(openqtsim.run_tasks(tasks, "heap", max_workers=4), serial, rtol=1e-4)
+
+
+def test_run_tasks_batch_engine():
+    tasks = openqtsim.task_grid(A=["M", "E2"], c=[1], nr_arr=[5000], lam=[3, 6], mu=[9], seed=[1, 2, 3])
+
+    factors = openqtsim.run_tasks(tasks, "batch", max_workers=3)
+
+    assert len(factors) == len(tasks)
+    np.testing.assert_array_equal(factors, openqtsim.batch_worker(tasks))
+    np.testing.assert_allclose(factors[:3], [0.5] * 3, rtol=0.25)
+
+
+def test_batch_worker_keeps_seeds_of_a_mixed_group():
+    seeded = openqtsim.Task("M", "E2", 1, 500, 6, 9, 3)
+    alone = openqtsim.batch_worker([seeded])
+
+    mixed = openqtsim.batch_worker([seeded._replace(seed=None), seeded, seeded._replace(lam=4, seed=None)])
+
+    assert mixed[1] == alone[0]
+    assert mixed[0] != alone[0]
+
+    # seeds above 2 ** 53 do not fit in a float column, they are taken from the tasks as they are
+    large = seeded._replace(seed=2 ** 60 + 1)
+    assert openqtsim.batch_worker([large._replace(seed=None), large])[1] == openqtsim.batch_worker([large])[0]
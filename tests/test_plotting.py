@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import openqtsim
+
+"""
+"""
+
+
+def test_decimate_step():
+    rng = np.random.default_rng(1)
+    t = np.cumsum(rng.exponential(size=100000))
+    c_s = rng.integers(0, 20, size=100000)
+
+    x, y = openqtsim.plotting.decimate_step(t, c_s, n_buckets=100)
+
+    assert len(x) == 300
+    assert np.all(np.diff(x) >= 0)
+    assert y.min() == c_s.min() and y.max() == c_s.max() and y[-1] == c_s[-1]
+
+    # every bucket keeps the extremes of the trace within that bucket
+    bucket = np.minimum(((t - t[0]) / ((t[-1] - t[0]) / 100)).astype(int), 99)
+    np.testing.assert_array_equal(y[1::3], pd.Series(c_s).groupby(bucket).max())
+
+
+def test_decimate_trace_in_chunks(tmp_path):
+    rng = np.random.default_rng(2)
+    n = 200000
+    df = pd.DataFrame({"t": np.cumsum(rng.exponential(size=n)), "c_s": rng.integers(0, 50, n),
+                       "c_q": rng.integers(0, 20, n)})
+    df.to_csv(tmp_path / "sys.csv", index=False)
+
+    # chunks that do not line up with the buckets give the same buckets as the whole trace in memory
+    chunked = openqtsim.plotting.decimate_trace(tmp_path / "sys.csv", n_buckets=100, chunksize=7001)
+    for column in ["c_s", "c_q"]:
+        t, values = openqtsim.plotting.decimate_step(df["t"], df[column], n_buckets=100)
+        np.testing.assert_allclose(chunked["t"], t, rtol=1e-12)
+        np.testing.assert_array_equal(chunked[column], values)
+
+
+def test_out_of_core(tmp_path):
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("M", 4), openqtsim.ServiceProcess("M", 5), 1)
+    sim = openqtsim.Simulation(q, seed=1)
+    sim.run(2000)
+    df_cust, df_sys = sim.return_log()
+
+    df_cust.to_csv(tmp_path / "cust.csv", index=False)
+    df_sys.to_csv(tmp_path / "sys.csv", index=False)
+
+    # decimating and counting per chunk gives the same result as in memory
+    trace = openqtsim.plotting.decimate_trace(df_sys, n_buckets=50)
+    chunked = openqtsim.plotting.decimate_trace(tmp_path / "sys.csv", n_buckets=50, chunksize=500)
+    assert len(trace) == 150
+    for column in ["t", "c_s", "c_q"]:
+        np.testing.assert_allclose(chunked[column], trace[column], rtol=1e-12)
+    assert chunked["c_s"].iloc[-1] == 0
+
+    counts, edges, mean = openqtsim.plotting.histogram_counts(tmp_path / "cust.csv", "ST", chunksize=300)
+    np.testing.assert_array_equal(counts, np.histogram(df_cust["ST"], bins=50)[0])
+    np.testing.assert_allclose(mean, df_cust["ST"].mean())
+
+    fig, axes = openqtsim.plotting.plot_IAT_ST(tmp_path / "cust.csv")
+    # the line at the mean spans the full height of the axes
+    np.testing.assert_allclose(axes[1].lines[0].get_xdata(), mean)
+    np.testing.assert_array_equal(axes[1].lines[0].get_ydata(), [0, 1])
+
+    fig, ax = sim.plot_system_state()
+    assert len(ax.lines[0].get_xdata()) <= 3 * 2000
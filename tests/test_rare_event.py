@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+import openqtsim
+
+"""
+"""
+
+
+def test_twisting_parameter():
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("M", 4), openqtsim.ServiceProcess("M", 5), 1)
+    assert openqtsim.rare_event.twisting_parameter(q) == 1
+
+    # E[exp(theta (ST - IAT))] = 1 for the gamma family
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("E3", 4), openqtsim.ServiceProcess("Gamma", 5, shape=0.5), 1)
+    theta = openqtsim.rare_event.twisting_parameter(q)
+    np.testing.assert_allclose((2.5 / (2.5 - theta)) ** 0.5 * (12 / (12 + theta)) ** 3, 1)
+
+    with pytest.raises(ValueError):
+        openqtsim.rare_event.twisting_parameter(openqtsim.Queue(c=2))
+
+
+def test_waiting_tail():
+    # M/M/1: P(W_q > x) = rho exp(-(mu - lambda) x), also far in the tail
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("M", 4), openqtsim.ServiceProcess("M", 5), 1)
+    for x in [0.5, 10]:
+        estimate = openqtsim.rare_event.waiting_tail(q, x, seed=1)
+        exact = 0.8 * np.exp(-x)
+        assert estimate.ci_low < exact < estimate.ci_high
+        assert estimate.std_err < 0.02 * exact
+
+    # M/E2/1 compared with a plain Lindley simulation
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("M", 4), openqtsim.ServiceProcess("E2", 5), 1)
+    estimate = openqtsim.rare_event.waiting_tail(q, 1, seed=2)
+    rng = np.random.default_rng(3)
+    W = openqtsim.lindley(rng.exponential(1 / 4, (1, 10 ** 6)), rng.gamma(2, 0.1, (1, 10 ** 6)))
+    np.testing.assert_allclose(estimate.probability, np.mean(W > 1), rtol=0.05)
+
+
+def test_splitting_tail():
+    # M/M/4 at a utilisation of 0.9: P(W_q > x) = P_wait exp(-(c mu - lambda) x), with P_wait from Erlang-C
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("M", 3.6), openqtsim.ServiceProcess("M", 1), 4)
+    estimate = openqtsim.rare_event.splitting_tail(q, 15, effort=500, n_rep=8, seed=1)
+    a = 3.6
+    terms = sum(a ** k / np.prod(np.arange(1, k + 1)) for k in range(4))
+    p_wait = a ** 4 / 24 / 0.1 / (terms + a ** 4 / 24 / 0.1)
+    exact = p_wait * np.exp(-0.4 * 15)
+    assert estimate.ci_low < exact < estimate.ci_high
+    assert estimate.std_err < 0.1 * exact
+
+    # E2/LN/2 compared with a plain simulation of the heap engine
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("E2", 3), openqtsim.ServiceProcess("LN", 2, sigma=1), 2)
+    estimate = openqtsim.rare_event.splitting_tail(q, 1.5, effort=500, n_rep=8, seed=2)
+    df = openqtsim.heap_engine.simulate(q, 5 * 10 ** 5, seed=3)
+    np.testing.assert_allclose(estimate.probability, np.mean(df["TCWQ"][10000:] > 1.5), rtol=0.1)
+
+    with pytest.raises(ValueError):
+        openqtsim.rare_event.splitting_tail(openqtsim.Queue(c=2, S=openqtsim.ServiceProcess("M", [3, 5])), 1)
@@ -0,0 +1,58 @@
+from collections import namedtuple
+
+import numpy as np
+import simpy
+import openqtsim
+
+"""
+"""
+
+Server = namedtuple('Server', 'id, srv_rate')
+
+
+def assignments(policy, n=6):
+    env = simpy.Environment()
+    servers = [Server(1, 1.0), Server(2, 3.0), Server(3, 2.0)]
+    pool = openqtsim.ServerPool(env, servers, policy=policy, rng=np.random.default_rng(1))
+
+    ids = []
+    for _ in range(n):
+        server = pool.get().value
+        ids.append(server.id)
+        pool.put(server)
+
+    return ids
+
+
+def test_policies():
+    assert assignments("fifo") == [1, 2, 3, 1, 2, 3]
+    assert assignments("fastest") == [2, 2, 2, 2, 2, 2]
+    assert assignments("round_robin") == [1, 2, 3, 1, 2, 3]
+    assert set(assignments("random", 50)) == {1, 2, 3}
+
+
+def test_waiting_customers_get_released_servers_in_order():
+    env = simpy.Environment()
+    pool = openqtsim.ServerPool(env, [Server(1, 1.0)])
+
+    first = pool.get()
+    second = pool.get()
+    third = pool.get()
+    assert first.triggered and not second.triggered
+
+    pool.put(first.value)
+    assert second.triggered and not third.triggered
+    assert len(pool) == 0
+
+
+def test_heterogeneous_servers():
+    A = openqtsim.ArrivalProcess("M", arr_rate=3)
+    S = openqtsim.ServiceProcess("M", srv_rate=[1, 4])
+
+    sim = openqtsim.Simulation(openqtsim.Queue(A, S, c=2), seed=1, policy="fastest")
+    sim.run(2000)
+    df_cust, df_sys = sim.return_log()
+
+    np.testing.assert_allclose(df_cust.groupby("s_id")["ST"].mean(), [1, 0.25], rtol=0.15)
+    counts = df_cust["s_id"].value_counts()
+    assert counts[2] > counts[1]
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import openqtsim
+from openqtsim.service import SimulationService
+
+"""
+"""
+
+
+def request(port, path, body=None):
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    with urllib.request.urlopen("http://127.0.0.1:{}{}".format(port, path), data=data, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def test_service():
+    tasks = [openqtsim.Task("M", "M", c, 500, 4, 6, seed) for c in [1, 2] for seed in [1, 2, 3, 4]]
+
+    async def scenario():
+        service = SimulationService(engine="heap", max_workers=2, executor="thread", batch_delay=0.1)
+        await service.start(port=0)
+        loop = asyncio.get_running_loop()
+
+        try:
+            # concurrent requests are coalesced into one batch
+            with ThreadPoolExecutor(len(tasks)) as clients:
+                responses = await asyncio.gather(*[
+                    loop.run_in_executor(clients, request, service.port, "/run", task._asdict()) for task in tasks])
+            assert service.batches < len(tasks)
+
+            # repeated scenarios come from the cache
+            again = await loop.run_in_executor(None, request, service.port, "/run", [task._asdict() for task in tasks])
+            health = await loop.run_in_executor(None, request, service.port, "/health")
+
+            try:
+                await loop.run_in_executor(None, request, service.port, "/run", {"A": "M"})
+                assert False
+            except urllib.error.HTTPError as error:
+                assert error.code == 400
+        finally:
+            await service.stop()
+
+        return responses, again, health
+
+    responses, again, health = asyncio.run(scenario())
+
+    factors = [response["results"][0]["waiting_factor"] for response in responses]
+    np.testing.assert_allclose(factors, [openqtsim.heap_worker(task) for task in tasks])
+    assert all(result["cached"] for result in again["results"])
+    np.testing.assert_allclose([result["waiting_factor"] for result in again["results"]], factors)
+    assert health["cache"] == len(tasks) and health["batches"] < len(tasks)
+
+
+def test_service_runs_duplicates_unseeded_and_bad_tasks():
+    fast = openqtsim.Task("M", "M", 1, 100, 4, 6, 1)
+    slow = openqtsim.Task("M", "M", 1, 100000, 4, 6, 2)
+
+    async def scenario():
+        service = SimulationService(engine="heap", max_workers=2, executor="thread", batch_delay=0.01)
+        await service.start(port=0)
+        try:
+            # a scenario that is listed twice, and a slow and a fast chunk that finish out of order
+            duplicates = await service.run([fast, fast])
+            out_of_order = await service.run([slow, fast._replace(seed=3)])
+
+            # tasks without a seed are run every time and not cached
+            unseeded = [await service.run([fast._replace(seed=None)]) for _ in range(2)]
+            cached = len(service.cache)
+        finally:
+            await service.stop()
+
+        # a task that the batch engine cannot run fails its own request only
+        service = SimulationService(engine="batch", max_workers=1, executor="thread", batch_delay=0.05)
+        await service.start(port=0)
+        try:
+            bad, good = await asyncio.gather(service.run([fast._replace(c=2)]), service.run([fast]),
+                                             return_exceptions=True)
+        finally:
+            await service.stop()
+
+        return duplicates, out_of_order, unseeded, cached, bad, good
+
+    duplicates, out_of_order, unseeded, cached, bad, good = asyncio.run(scenario())
+
+    assert duplicates[0] == duplicates[1]
+    np.testing.assert_allclose([value for key, value, hit in out_of_order],
+                               [openqtsim.heap_worker(slow), openqtsim.heap_worker(fast._replace(seed=3))])
+    assert not any(hit for result in unseeded for key, value, hit in result)
+    assert unseeded[0][0][1] != unseeded[1][0][1]
+    assert cached == 3
+
+    assert isinstance(bad, ValueError)
+    np.testing.assert_allclose(good[0][1], openqtsim.batch_worker([fast])[0])
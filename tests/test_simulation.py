@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import openqtsim
+
+"""
+"""
+
+
+def run(seed, nr_arr=1000):
+    queue = openqtsim.Queue(openqtsim.ArrivalProcess("M", 8), openqtsim.ServiceProcess("E2", 3), c=3)
+    sim = openqtsim.Simulation(queue, seed=seed)
+    sim.run(nr_arr)
+    df_cust, df_sys = sim.return_log()
+
+    return df_cust
+
+
+def test_seed_is_reproducible_within_threads():
+    reference = run(1)
+
+    # simulations in threads interleave, but each owns its random streams
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(run, [1, 2, 1, 2]))
+
+    np.testing.assert_array_equal(results[0]["ST"], reference["ST"])
+    np.testing.assert_array_equal(results[2]["ST"], reference["ST"])
+    assert not np.array_equal(results[1]["ST"], reference["ST"])
+
+
+def test_heap_engine_uses_the_same_streams():
+    queue = openqtsim.Queue(openqtsim.ArrivalProcess("M", 8), openqtsim.ServiceProcess("E2", 3), c=3)
+
+    df_simpy = run(3).sort_values("c_id")
+    df_heap = openqtsim.heap_engine.simulate(queue, 1000, seed=3)
+
+    np.testing.assert_array_equal(df_simpy["s_id"], df_heap["s_id"])
+    np.testing.assert_allclose(df_simpy["TSB"], df_heap["TSB"], atol=1e-4)
+
+
+def test_heap_engine_draws_the_same_arrivals():
+    # hyperexponential, phase-type and smoothed empirical values depend on the size of a draw, so both engines draw
+    # the arrivals in the blocks of a Sampler
+    for A in [openqtsim.ArrivalProcess("H2", 8, cv=2),
+              openqtsim.ArrivalProcess("PH", 8, alpha=[0.5, 0.5], T=[[-2, 1], [0, -3]]),
+              openqtsim.ArrivalProcess("Emp", 8, data=[1., 2., 4.], bandwidth=0.3)]:
+        queue = openqtsim.Queue(A, openqtsim.ServiceProcess("M", 5), c=2)
+
+        sim = openqtsim.Simulation(queue, seed=1)
+        sim.run(1500)
+        df_simpy = sim.return_log()[0].sort_values("c_id")
+        df_heap = openqtsim.heap_engine.simulate(queue, 1500, seed=1)
+
+        np.testing.assert_array_equal(df_simpy["IAT"], df_heap["IAT"])
+        np.testing.assert_array_equal(df_simpy["ST"], df_heap["ST"])
+
+
+def test_mm1_seed():
+    IAT_1, ST_1 = openqtsim.MM1(8, 9, 100, seed=1).get_IAT_and_ST()
+    IAT_2, ST_2 = openqtsim.MM1(8, 9, 100, seed=1).get_IAT_and_ST()
+
+    np.testing.assert_array_equal(IAT_1, IAT_2)
+    np.testing.assert_array_equal(ST_1, ST_2)
+
+
+def test_simulations_on_a_shared_queue():
+    queue = openqtsim.Queue(openqtsim.ArrivalProcess("M", 8), openqtsim.ServiceProcess("E2", 3), c=3)
+    reference = run(1, nr_arr=200)
+
+    # the second simulation on the same queue must not replace the arrival stream of the first
+    sim_1 = openqtsim.Simulation(queue, seed=1)
+    sim_2 = openqtsim.Simulation(queue, seed=2)
+    sim_1.run(200)
+    sim_2.run(200)
+
+    df_1 = sim_1.return_log()[0]
+    df_2 = sim_2.return_log()[0]
+    np.testing.assert_array_equal(df_1["IAT"], reference["IAT"])
+    np.testing.assert_array_equal(df_2["IAT"], run(2, nr_arr=200)["IAT"])
@@ -0,0 +1,73 @@
+import numpy as np
+import openqtsim
+
+"""
+"""
+
+
+def test_scenario_hash():
+    task = openqtsim.Task("M", "M", 1, 100, 8, 9, 1)
+
+    assert openqtsim.scenario_hash(task) == openqtsim.scenario_hash(task._replace(lam=np.int64(8)))
+    assert openqtsim.scenario_hash(task) != openqtsim.scenario_hash(task._replace(seed=2))
+    assert openqtsim.scenario_hash(task) != openqtsim.scenario_hash(task, engine_version="v0.0.0")
+    assert openqtsim.scenario_hash(task, engine="a") != openqtsim.scenario_hash(task, engine="b")
+
+
+def test_sweep_only_computes_missing_cells(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    tasks = openqtsim.task_grid(c=[1, 2], nr_arr=[200], lam=[4, 6], mu=[9], seed=[1])
+
+    first = openqtsim.sweep(tasks, cache=path, processes=1)
+    assert len(openqtsim.ResultCache(path)) == 4
+
+    calls = []
+
+    def counting_worker(task):
+        calls.append(task)
+        return openqtsim.worker(task)
+
+    extra = openqtsim.Task("M", "M", 1, 200, 5, 9, 1)
+    second = openqtsim.sweep(tasks + [extra], cache=path, processes=1, func=counting_worker,
+                             engine="openqtsim.mt_engine.worker")
+
+    assert calls == [extra]
+    np.testing.assert_almost_equal(second[:4], first)
+    assert len(openqtsim.ResultCache(path)) == 5
+
+
+def test_sweep_cache_keys(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    tasks = openqtsim.task_grid(nr_arr=[200], lam=[4, 6], mu=[9], seed=[1])
+    openqtsim.sweep(tasks, cache=path, processes=1)
+
+    # results of another engine are not taken from the cache
+    assert openqtsim.sweep(tasks, cache=path, processes=1, func=lambda task: 999) == [999, 999]
+
+    # tasks without a seed are computed every time and not cached
+    calls = []
+
+    def counting_worker(task):
+        calls.append(task)
+        return len(calls)
+
+    unseeded = [task._replace(seed=None) for task in tasks]
+    assert openqtsim.sweep(unseeded * 2, cache=path, processes=1, func=counting_worker) == [1, 2, 3, 4]
+    assert len(openqtsim.ResultCache(path)) == 4
+
+
+def test_interrupted_sweep_keeps_results(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    tasks = openqtsim.task_grid(nr_arr=[200], lam=[1, 2, 3, 4, 5], mu=[9], seed=[1])
+
+    def failing_worker(task):
+        if task.lam == 5:
+            raise RuntimeError("interrupted")
+        return task.lam
+
+    try:
+        openqtsim.sweep(tasks, cache=path, processes=1, func=failing_worker, commit_every=2)
+    except RuntimeError:
+        pass
+
+    assert len(openqtsim.ResultCache(path)) == 4
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import openqtsim
+
+"""
+"""
+
+
+def test_record():
+    recorder = openqtsim.SystemState()
+    for t, c_s, c_q in [(1, 1, 1), (1, 1, 0), (2, 0, 0), (3, 1, 1), (3, 1, 0)]:
+        recorder.record(t, c_s, c_q)
+
+    np.testing.assert_array_equal(recorder.to_frame().values, [[0, 0, 0], [1, 1, 0], [2, 0, 0], [3, 1, 0]])
+
+    recorder = openqtsim.SystemState(change_points=True)
+    for t, c_s, c_q in [(1, 0, 0), (2, 1, 1), (2, 0, 0), (3, 1, 0), (4, 1, 0)]:
+        recorder.record(t, c_s, c_q)
+
+    np.testing.assert_array_equal(recorder.to_frame().values, [[0, 0, 0], [3, 1, 0]])
+
+    recorder = openqtsim.SystemState(resolution=0.5)
+    for t, c_s, c_q in [(0.1, 1, 0), (0.2, 2, 1), (0.7, 1, 0)]:
+        recorder.record(t, c_s, c_q)
+
+    np.testing.assert_array_equal(recorder.to_frame().values, [[0, 0, 0], [0.5, 2, 1], [1, 1, 0]])
+
+
+def test_simulation_trace():
+    # deterministic queue with a waiting customer: arrivals at 1, 2 and 5, service times of 2
+    IAT = pd.DataFrame({"IAT": [1., 1., 3.]})
+    ST = pd.DataFrame({"ST": [2., 2., 2.]}, index=np.arange(1, 4))
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("D", IAT), openqtsim.ServiceProcess("D", ST), 1)
+
+    sim = openqtsim.Simulation(q)
+    sim.run(3)
+    df_cust, df_sys = sim.return_log()
+
+    np.testing.assert_allclose(df_sys["t"], [0, 1, 2, 3, 5, 7], atol=1e-6)
+    np.testing.assert_array_equal(df_sys["c_s"], [0, 1, 2, 1, 1, 0])
+    np.testing.assert_array_equal(df_sys["c_q"], [0, 0, 1, 0, 0, 0])
+
+    # the trace is in order of time and every customer arrives and leaves
+    q = openqtsim.Queue(openqtsim.ArrivalProcess("M", 4), openqtsim.ServiceProcess("M", 2.5), 2)
+    sim = openqtsim.Simulation(q, seed=1)
+    sim.run(500)
+    df_cust, df_sys = sim.return_log()
+
+    assert np.all(np.diff(df_sys["t"]) > 0)
+    assert np.all(df_sys["c_q"] <= df_sys["c_s"])
+    assert df_sys["c_s"].iloc[-1] == 0
+
+    sim = openqtsim.Simulation(q, seed=1, state_resolution=1)
+    sim.run(500)
+    assert len(sim.return_log()[1]) <= np.ceil(df_sys["t"].iloc[-1]) + 1